@@ -0,0 +1,19 @@
+"""Opções de linha de comando do pytest para o teste JT (jt_juris_teste 1.py)."""
+import os
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--trts",
+        action="store",
+        default=None,
+        help="TRTs a extrair, ex.: TRT3,TRT24 (mesmo efeito de JT_TRTS)",
+    )
+
+
+def pytest_configure(config):
+    # O teste resolve os TRTs por _ler_trts_cli (--trts do sys.argv ou JT_TRTS); a opção
+    # também vai para JT_TRTS para valer em processos sem o argv original (ex.: xdist)
+    trts = config.getoption("trts")
+    if trts:
+        os.environ["JT_TRTS"] = trts
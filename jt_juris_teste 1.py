@@ -1,38 +1,691 @@
 import os
 import re
+import sys
 import json
 import time
+import argparse
 import logging
+import functools
+import contextlib
+import copy
+import shutil
+import tempfile
 import traceback
 import unicodedata
-from typing import List, Tuple, Optional, Iterable
+from xml.sax.saxutils import escape as xml_escape
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Optional, Iterable, NamedTuple
 
 from seleniumbase import BaseCase
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver import ActionChains
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 
 try:
     import pyperclip
 except Exception:
     pyperclip = None
 
+try:
+    import win32clipboard
+except Exception:
+    win32clipboard = None
+
 try:
     from bs4 import BeautifulSoup
 except Exception:
     BeautifulSoup = None
 
+# Parser do BeautifulSoup: lxml (em C) quando disponível, senão o html.parser nativo
+_BS_PARSER = 'html.parser'
+if BeautifulSoup is not None:
+    try:
+        BeautifulSoup('', 'lxml')
+        _BS_PARSER = 'lxml'
+    except Exception:
+        pass
+
+try:
+    from lxml import html as lxml_html
+except Exception:
+    lxml_html = None
+
 from docx import Document
 from docx.shared import Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_LINE_SPACING
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import qn, nsdecls
 from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from lxml import etree
+from lxml.etree import SubElement
 
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("JT_TESTE")
 
+# Diretório deste script (resolvido uma vez na importação)
+_MODULE_DIR = Path(__file__).resolve().parent
+
+# Implicit wait durante a sondagem de candidatos (selecionar_turma): com implicit wait
+# ativo, cada find_elements vazio pagaria o timeout inteiro, multiplicando as esperas
+# explícitas (WebDriverWait). O valor anterior é restaurado ao sair.
+_IMPLICIT_WAIT_SONDAGEM = 0
+
+# TRTs suportados e o padrão usado quando não há escolha (JT_AUTO_MODE=1 ou sem TTY)
+_TRTS_DISPONIVEIS = ("TRT3", "TRT24")
+_TRTS_PADRAO = ["TRT3", "TRT24"]
+
+
+def _ler_trts_cli() -> Optional[str]:
+    """--trts TRT3,TRT24 da linha de comando, ou JT_TRTS.
+
+    Lido na hora do uso (não na importação) e com parse_known_args para conviver com os
+    argumentos do pytest; um --trts malformado (ex: sem valor) cai no JT_TRTS em vez de
+    encerrar o processo. No pytest a opção --trts é registrada pelo conftest.py.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--trts')
+    try:
+        args, _ = parser.parse_known_args()
+    except SystemExit:
+        logger.warning("Argumento --trts inválido; usando JT_TRTS")
+        args = None
+    return (args.trts if args else None) or os.environ.get('JT_TRTS')
+
+
+# Verificação de filtro marcado em uma única chamada ao navegador (mesmos critérios
+# de verificar_filtro_marcado: aria-*, classes do elemento/pai e checkbox interno)
+_JS_FN_FILTRO_MARCADO = """
+function filtroMarcado(el) {
+    if (!el) return false;
+    if (el.getAttribute('aria-checked') === 'true' || el.getAttribute('aria-selected') === 'true') return true;
+    var marcadores = ['selected', 'checked', 'active', 'p-highlight', 'p-checked', 'selecionado'];
+    function temMarcador(n) {
+        var cls = (n && n.getAttribute) ? (n.getAttribute('class') || '') : '';
+        return marcadores.some(function (m) { return cls.indexOf(m) !== -1; });
+    }
+    var pai = el.parentElement;
+    if (temMarcador(el) || temMarcador(pai)) return true;
+    var cb = el.querySelector("input[type='checkbox']");
+    if (cb && cb.checked) return true;
+    if (pai) {
+        cb = pai.querySelector("input[type='checkbox']");
+        if (cb && cb.checked) return true;
+    }
+    return false;
+}
+"""
+_JS_FILTRO_MARCADO = _JS_FN_FILTRO_MARCADO + "return filtroMarcado(arguments[0]);"
+
+# Avalia uma lista de XPaths no navegador e devolve o primeiro nó visível, seu pai
+# (elemento clicável do filtro) e o estado "marcado" — uma chamada em vez de N.
+# arguments[1] (opcional) é a união '|' dos candidatos: se não casar nada, retorna
+# null após uma única avaliação, sem percorrer a lista
+_JS_PRIMEIRO_VISIVEL = _JS_FN_FILTRO_MARCADO + """
+var xpaths = arguments[0] || [];
+if (arguments[1]) {
+    try {
+        var u = document.evaluate(arguments[1], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        if (u.snapshotLength === 0) return null;
+    } catch (e) {}
+}
+for (var k = 0; k < xpaths.length; k++) {
+    var r;
+    try {
+        r = document.evaluate(xpaths[k], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    } catch (e) {
+        continue;
+    }
+    for (var i = 0; i < r.snapshotLength; i++) {
+        var n = r.snapshotItem(i);
+        if (n.nodeType !== 1) continue;
+        if (!(n.offsetWidth || n.offsetHeight || n.getClientRects().length)) continue;
+        var pai = n.parentElement || n;
+        return {span: n, item: pai, xpath: xpaths[k], indice: k, marcado: filtroMarcado(pai)};
+    }
+}
+return null;
+"""
+
+# Estratégias de clique em filtro executadas no navegador: a partir do índice
+# arguments[1], dispara a primeira que não lançar erro e devolve {metodo, marcado}
+_JS_CLIQUE_FILTRO = _JS_FN_FILTRO_MARCADO + """
+var el = arguments[0], inicio = arguments[1] || 0;
+var estrategias = [
+    function () { el.click(); },
+    function () {
+        var span = el.querySelector('span.nome-item');
+        if (!span) throw new Error('sem span interno');
+        span.click();
+    },
+    function () {
+        el.dispatchEvent(new MouseEvent('click', {view: window, bubbles: true, cancelable: true}));
+    }
+];
+for (var i = inicio; i < estrategias.length; i++) {
+    try {
+        estrategias[i]();
+    } catch (e) {
+        continue;
+    }
+    return {metodo: i + 1, marcado: filtroMarcado(el)};
+}
+return {metodo: 0, marcado: filtroMarcado(el)};
+"""
+
+# [data-card-id, id do DOM] de cada cartão em uma única chamada
+_JS_IDS_CARTOES = """
+return arguments[0].map(function (e) {
+    return [e.getAttribute('data-card-id') || '', e.id || ''];
+});
+"""
+
+# Elementos visíveis de um XPath (contexto: documento) em uma única chamada,
+# em vez de um is_displayed() por elemento
+_JS_VISIVEIS_XPATH = """
+var r = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var out = [];
+for (var i = 0; i < r.snapshotLength; i++) {
+    var n = r.snapshotItem(i);
+    if (n.nodeType !== 1) continue;
+    var b = n.getBoundingClientRect();
+    if (b.width > 0 && b.height > 0 && getComputedStyle(n).visibility !== 'hidden') out.push(n);
+}
+return out;
+"""
+
+# Linhas de cabeçalho de cada cartão (arguments[0]) em uma única chamada: primeira seção
+# visível de arguments[1] (relativa ao cartão) com linhas arguments[2] não vazias; o
+# resultado fica alinhado 1:1 com a lista de cartões
+_JS_CABECALHOS_CARTOES = """
+var cards = arguments[0], xpSec = arguments[1], xpLin = arguments[2];
+function visivel(n) {
+    var b = n.getBoundingClientRect();
+    return b.width > 0 && b.height > 0;
+}
+return cards.map(function (card) {
+    try {
+        var secs = document.evaluate(xpSec, card, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var i = 0; i < secs.snapshotLength; i++) {
+            var sec = secs.snapshotItem(i);
+            if (sec.nodeType !== 1 || !visivel(sec)) continue;
+            var ls = document.evaluate(xpLin, sec, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var out = [];
+            for (var j = 0; j < ls.snapshotLength; j++) {
+                var l = ls.snapshotItem(j);
+                var t = (l.innerText || l.textContent || '').replace(/\\s+/g, ' ').trim();
+                if (t) out.push(t);
+            }
+            if (out.length) return out;
+        }
+    } catch (e) {}
+    return [];
+});
+"""
+
+# Para cada seção de cabeçalho, o ancestral mais próximo que contém o botão de copiar
+# (span.doc-botao-icone 'content_copy'); caminhada linear pelos pais, todas as seções em uma chamada
+_JS_CARTAO_DA_SECAO = """
+return arguments[0].map(function (sec) {
+    for (var n = sec.parentElement; n; n = n.parentElement) {
+        var spans = n.querySelectorAll('span.doc-botao-icone');
+        for (var i = 0; i < spans.length; i++) {
+            if ((spans[i].textContent || '').trim() === 'content_copy') return n;
+        }
+    }
+    return sec;
+});
+"""
+
+# Texto da ementa de cada cartão (arguments[0]) direto do DOM, sem clipboard: o primeiro nó de
+# arguments[1] (relativo ao cartão; null = o próprio cartão) percorrido como o innerText, com
+# quebra de linha em elementos de bloco e <br>, pulando botões/ícones e nós ocultos (as
+# limpezas de _limpar_ementa dependem das quebras). Alinhado 1:1 com a lista de cartões
+_JS_EMENTAS_CARTOES = """
+var cards = arguments[0], xp = arguments[1];
+var EXCLUIR = 'button, script, style, .doc-botao-icone, .material-icons';
+function texto(raiz) {
+    var partes = [];
+    (function walk(el) {
+        for (var c = el.firstChild; c; c = c.nextSibling) {
+            if (c.nodeType === 3) { partes.push(c.nodeValue.replace(/\\s+/g, ' ')); continue; }
+            if (c.nodeType !== 1 || c.matches(EXCLUIR)) continue;
+            if (c.tagName === 'BR') { partes.push('\\n'); continue; }
+            var d = window.getComputedStyle(c).display;
+            if (d === 'none') continue;
+            var bloco = d.indexOf('inline') !== 0 && d !== 'contents';
+            if (bloco) partes.push('\\n');
+            walk(c);
+            if (bloco) partes.push('\\n');
+        }
+    })(raiz);
+    return partes.join('').replace(/[ \\t]*\\n[ \\t]*/g, '\\n').replace(/\\n{2,}/g, '\\n').trim();
+}
+return cards.map(function (card) {
+    try {
+        var n = xp ? document.evaluate(xp, card, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue : card;
+        return n ? texto(n) : '';
+    } catch (e) {
+        return '';
+    }
+});
+"""
+
+# MutationObserver que marca window.__jtDomDirty a cada alteração do DOM. Idempotente:
+# reinstala só se a página tiver sido recarregada (o objeto window é novo)
+_JS_INSTALAR_OBSERVER = """
+if (!window.__jtDomObserver && document.body) {
+    window.__jtDomDirty = false;
+    window.__jtDomObserver = new MutationObserver(function () { window.__jtDomDirty = true; });
+    window.__jtDomObserver.observe(document.body, {childList: true, subtree: true});
+}
+return !!window.__jtDomObserver;
+"""
+
+# Lê e zera a marca de alteração do DOM
+_JS_CONSUMIR_DOM_DIRTY = """
+var d = !!window.__jtDomDirty;
+window.__jtDomDirty = false;
+return d;
+"""
+
+# Botão "x" dos chips de TRT na área de filtros aplicados (não pega chips de turma)
+_XP_REMOVE_TRT = (
+    "//div[contains(@class,'p-chip')]"
+    "[.//div[contains(@class,'p-chip-text') and contains(text(),'TRT')]]"
+    "//span[contains(@class,'pi-chip-remove-icon') and contains(@class,'pi-times-circle')]"
+)
+
+
+_RE_WS = re.compile(r"\s+")
+_RE_TRT = re.compile(r"^(?:TRT)?\s*(\d+)$", re.IGNORECASE)
+_RE_TURMA = re.compile(r"^(\d+)\s*ª\s*Turma$", re.IGNORECASE)
+# Campos do cabeçalho do cartão, aplicados às linhas unidas por '\n' (re.M: uma linha por vez;
+# [^\S\n] evita que o espaço opcional atravesse para a linha seguinte)
+_RE_CNJ = re.compile(r"\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}")
+_RE_TRIB = re.compile(r"\bTRT\d{1,2}\b")
+_RE_RELATORIA = re.compile(r"^.*\bRelatoria de\b[^\S\n]*(.*)$", re.IGNORECASE | re.MULTILINE)
+_RE_TURMA_CAB = re.compile(r"^.*\b\d{1,2}ª[^\S\n]*Turma\b.*$", re.IGNORECASE | re.MULTILINE)
+_RE_JUNTADA = re.compile(r"^.*Juntado aos autos em[^\S\n]*(.*)$", re.IGNORECASE | re.MULTILINE)
+# Limpeza da ementa copiada: (padrão, substituição) aplicados em ordem antes de procurar o
+# marcador "Ementa:" e, depois dele, para normalizar reticências e texto cortado nas pontas.
+# O colapso de espaços é feito uma única vez no final (_RE_WS).
+_RE_TAG_HTML = re.compile(r'<[^>]+>')
+# Marcação copiada como texto simples pelo botão (uma varredura para as três tags)
+_RE_MARCACAO_HTML = re.compile(r'<(?:div|section|button)')
+# URLs na ementa (entre <...> ou soltas), viram hyperlinks no DOCX. Um único grupo de
+# captura: split devolve [texto, url, texto, url, ..., texto]
+_RE_URL_SPLIT = re.compile(r'(<https?://[^>\s]+>|https?://\S+)')
+# Limpeza do texto bruto em uma única passada: cabeçalho "Acórdão", "Inteiro teor" (com e
+# sem parênteses), botão "ler inteiro teor" e fragmentos cortados antes da ementa
+# (ex: "...1731-25.2010.5.24.0022"). A substituição depende do grupo que casou
+_RE_EMENTA_LIXO = re.compile(
+    r'(?P<inicio>\AAcórdão\s*)'
+    r'|(?P<ws>\s*)(?:(?P<teor>Inteiro teor\s*\([^)]*\)|Inteiro teor[^\n.]*)'
+    r'|(?P<espaco>ler inteiro teor\s*,?\s*|Inteiro\s+teor\s*))'
+    r'|(?P<fragmento>\.{3,}\d{4}-\d{2}\.\d{4}\.\d+\.\d{2}\.\d{4}[^\n]*)',
+    re.IGNORECASE,
+)
+
+
+def _repl_ementa_lixo(m) -> str:
+    if m.group('teor') is not None:
+        return m.group('ws')  # remove só o "Inteiro teor...", mantém o espaço/quebra anterior
+    if m.group('espaco') is not None:
+        return ' '
+    return ''
+
+
+_RE_MARCADOR_EMENTA = re.compile(r'Ementa:\s*\n(.+)', re.DOTALL | re.IGNORECASE)
+_RE_MARCADOR_EMENTA_INLINE = re.compile(r'Ementa:\s*(.+)', re.DOTALL | re.IGNORECASE)
+_EMENTA_CLEANERS_FINAIS = (
+    (re.compile(r'\.{4,}'), '...'),              # Normaliza reticências
+    (re.compile(r'^\.{3,}[a-z]+\s+'), ''),       # Remove início cortado (ex: "...uando")
+    (re.compile(r'\s+[a-z]+\.{3,}$'), ''),       # Remove fim cortado
+)
+# Cabeçalhos de seções de dissídios (SDI-1, SDI-2, SDC), que não entram no documento
+_RE_BANNED = re.compile(
+    r"(?:1ª|2ª)\s*seção\s+de\s+dissídios\s+individuais|seção\s+de\s+dissídios\s+coletivos",
+    re.IGNORECASE,
+)
+
+
+def _fast_paste() -> str:
+    """Texto do clipboard: CF_UNICODETEXT direto via win32clipboard no Windows, pyperclip nos demais."""
+    if win32clipboard is not None:
+        win32clipboard.OpenClipboard(0)
+        try:
+            if not win32clipboard.IsClipboardFormatAvailable(win32clipboard.CF_UNICODETEXT):
+                return ''
+            return win32clipboard.GetClipboardData(win32clipboard.CF_UNICODETEXT) or ''
+        finally:
+            win32clipboard.CloseClipboard()
+    return pyperclip.paste() or ''
+
+
+def _fast_copy(texto: str):
+    """Substitui o conteúdo do clipboard (win32clipboard no Windows, pyperclip nos demais)."""
+    if win32clipboard is not None:
+        win32clipboard.OpenClipboard(0)
+        try:
+            win32clipboard.EmptyClipboard()
+            if texto:
+                win32clipboard.SetClipboardText(texto, win32clipboard.CF_UNICODETEXT)
+        finally:
+            win32clipboard.CloseClipboard()
+        return
+    pyperclip.copy(texto)
+
+
+def _ler_ementa_dom_check() -> int:
+    """JT_EMENTA_DOM_CHECK: quantos cartões por turma conferem a ementa do DOM com a do clipboard (padrão 0)."""
+    try:
+        return max(0, int(os.environ.get("JT_EMENTA_DOM_CHECK", "0")))
+    except ValueError:
+        return 0
+
+
+def _ler_save_every() -> int:
+    """JT_SAVE_EVERY: blocos acumulados em memória entre dois saves do DOCX (padrão 25)."""
+    try:
+        return max(1, int(os.environ.get("JT_SAVE_EVERY", "25")))
+    except ValueError:
+        return 25
+
+
+# Quando o sumário é atualizado via Word COM (JT_TOC_UPDATE): 'per_block' salva e repagina a
+# cada escrita do buffer (comportamento antigo), 'per_flush' a cada save em lote (JT_SAVE_EVERY)
+# e 'final_only' (padrão) uma única vez, com o documento completo
+_TOC_UPDATE_MODES = ('per_block', 'per_flush', 'final_only')
+
+
+def _ler_toc_update_mode() -> str:
+    modo = os.environ.get("JT_TOC_UPDATE", "final_only").strip().lower()
+    if modo not in _TOC_UPDATE_MODES:
+        logger.warning(f"JT_TOC_UPDATE inválido ({modo!r}); usando 'final_only'")
+        return 'final_only'
+    return modo
+
+
+def _parse_trts(valor: Optional[str]) -> List[str]:
+    """Converte 'TRT3,TRT24' (ou '3 24') na lista de siglas, ignorando itens desconhecidos."""
+    trts: List[str] = []
+    for tok in re.split(r"[,;\s]+", (valor or "").strip()):
+        if not tok:
+            continue
+        m = _RE_TRT.match(tok)
+        sigla = f"TRT{int(m.group(1))}" if m else tok
+        if sigla not in _TRTS_DISPONIVEIS:
+            logger.warning(f"⚠️ TRT desconhecido ignorado: '{tok}' (disponíveis: {', '.join(_TRTS_DISPONIVEIS)})")
+            continue
+        if sigla not in trts:
+            trts.append(sigla)
+    return trts
+
+
+@functools.lru_cache(maxsize=256)
+def _variantes_turma_label(txt: str) -> Tuple[str, ...]:
+    """Variantes do rótulo da turma (com e sem zero à esquerda), sem repetição e mantendo a ordem."""
+    try:
+        s = _RE_WS.sub(" ", (txt or "").strip())
+        variantes = [s]
+        m = _RE_TURMA.match(s)
+        if m:
+            num = m.group(1)
+            no_zero = str(int(num))
+            zero2 = str(num).zfill(2)
+            for v in (f"{no_zero}ª Turma", f"{zero2}ª Turma"):
+                if v not in variantes:
+                    variantes.append(v)
+        return tuple(dict.fromkeys(variantes))
+    except Exception:
+        return (txt,)
+
+
+@functools.lru_cache(maxsize=256)
+def _candidatos_turma(nome: str, turma_tmpl: Optional[str]) -> Tuple[str, ...]:
+    """XPaths candidatos para localizar a turma: template do seletor + fallbacks por texto."""
+    labels = _variantes_turma_label(nome)
+    candidatos = []
+    if turma_tmpl:
+        for lab in labels:
+            try:
+                candidatos.append(turma_tmpl.format(lab))
+            except Exception:
+                pass
+    # Fallbacks por texto - seletores mais específicos
+    for lab in labels:
+        candidatos.extend([
+            f"//div[contains(@class,'filtro-item')]//span[contains(@class,'nome-item') and normalize-space()='{lab}']",
+            f"//div[contains(@class,'filtro-item')]//span[contains(normalize-space(),'{lab}')]",
+            f"//span[contains(@class,'nome-item') and contains(normalize-space(),'{lab}')]",
+        ])
+    return tuple(candidatos)
+
+
+@functools.lru_cache(maxsize=256)
+def _xpath_uniao(xpaths: Tuple[str, ...]) -> Optional[str]:
+    """Une XPaths absolutos com '|' em uma única expressão (None se algum não for absoluto).
+
+    A união devolve nós em ordem de documento, não de prioridade: serve para testar
+    presença; a escolha do candidato continua respeitando a ordem da lista.
+    """
+    partes = [xp.strip() for xp in xpaths if xp and xp.strip()]
+    if not partes or not all(xp.startswith(('/', '(')) for xp in partes):
+        return None
+    return " | ".join(partes)
+
+
+@functools.lru_cache(maxsize=256)
+def _candidatos_turma_expandidos(nome: str, turma_tmpl: Optional[str]) -> Tuple[str, ...]:
+    """Candidatos de _candidatos_turma + XPaths super genéricos para a busca pós-expansão."""
+    candidatos = list(_candidatos_turma(nome, turma_tmpl))
+    for lab in _variantes_turma_label(nome):
+        candidatos.extend([
+            # Busca em QUALQUER div/span que contenha o texto exato
+            f"//*[contains(@class,'filtro') and contains(text(),'{lab}')]",
+            f"//*[contains(@class,'item') and contains(text(),'{lab}')]",
+            # Busca por texto direto (mais permissivo)
+            f"//*[contains(text(),'{lab}')]",
+        ])
+    return tuple(candidatos)
+
+
+# Nomes qualificados dos runs da ementa, resolvidos uma vez na importação
+_QN_RSTYLE = qn('w:rStyle')
+_QN_RFONTS = qn('w:rFonts')
+_QN_SZ = qn('w:sz')
+_QN_VAL = qn('w:val')
+_QN_ASCII = qn('w:ascii')
+_QN_HANSI = qn('w:hAnsi')
+_QN_CS = qn('w:cs')
+# Estilo de parágrafo dos blocos (justificado, espaçamento duplo), criado no documento na
+# primeira gravação: cada parágrafo leva só um w:pStyle em vez de jc + spacing diretos
+_ESTILO_EMENTA = 'EmentaBody'
+
+# Espaço antes da primeira linha de cada bloco (substitui o parágrafo em branco separador)
+_ESPACO_ENTRE_BLOCOS = Pt(12)
+
+# Fonte dos runs (Arial MT 8pt), criada uma vez em vez de um Pt(8) por run
+_ARIAL = 'Arial MT'
+_PT8 = Pt(8)
+
+# Tab e quebras viram w:tab/w:br (mesma tradução do python-docx em run.text)
+_RE_CTRL_RUN = re.compile(r'([\t\r\n])')
+
+
+def _montar_rpr(hyperlink: bool):
+    """w:rPr Arial MT 8pt (com estilo Hyperlink se pedido); usado só para montar os modelos."""
+    rPr = OxmlElement('w:rPr')
+    if hyperlink:
+        SubElement(rPr, _QN_RSTYLE).set(_QN_VAL, 'Hyperlink')
+    fonts = SubElement(rPr, _QN_RFONTS)
+    fonts.set(_QN_ASCII, _ARIAL)
+    fonts.set(_QN_HANSI, _ARIAL)
+    if hyperlink:
+        fonts.set(_QN_CS, _ARIAL)
+    SubElement(rPr, _QN_SZ).set(_QN_VAL, '16')
+    return rPr
+
+
+# Modelos de rPr montados uma vez; cada run recebe uma cópia (deepcopy)
+_RPR_TEXTO = _montar_rpr(hyperlink=False)
+_RPR_HYPERLINK = _montar_rpr(hyperlink=True)
+
+
+def _fonte_arial8(run):
+    """Arial MT 8pt em um run do python-docx (mesmo XML de font.name + font.size)."""
+    if run._r.rPr is None:
+        run._r.insert(0, copy.deepcopy(_RPR_TEXTO))
+    else:
+        run.font.name = _ARIAL
+        run.font.size = _PT8
+
+
+def _rpr_xml(rPr) -> str:
+    """rPr do modelo serializado sem declarações de namespace (vão no wrapper do parse)."""
+    return re.sub(r' xmlns:\w+="[^"]*"', '', etree.tostring(rPr, encoding='unicode'))
+
+
+# Moldes de texto para montar os runs da ementa como string e parsear uma vez por parágrafo
+_XML_RPR_TEXTO = _rpr_xml(_RPR_TEXTO)
+_XML_RPR_HYPERLINK = _rpr_xml(_RPR_HYPERLINK)
+_XML_EMENTA_WRAPPER = '<w:p %s>%%s</w:p>' % nsdecls('w', 'r')
+
+
+def _xml_run(texto: str, hyperlink: bool = False) -> str:
+    """w:r Arial MT 8pt (estilo Hyperlink se pedido) como string XML.
+
+    O XML é o mesmo de p.add_run() + font.name/font.size.
+    """
+    partes = ['<w:r>', _XML_RPR_HYPERLINK if hyperlink else _XML_RPR_TEXTO]
+    for parte in _RE_CTRL_RUN.split(texto):
+        if not parte:
+            continue
+        if parte == '\t':
+            partes.append('<w:tab/>')
+        elif parte in '\r\n':
+            partes.append('<w:br/>')
+        elif len(parte.strip()) < len(parte):
+            partes.append('<w:t xml:space="preserve">%s</w:t>' % xml_escape(parte))
+        else:
+            partes.append('<w:t>%s</w:t>' % xml_escape(parte))
+    partes.append('</w:r>')
+    return ''.join(partes)
+
+
+def _xml_hyperlink(part, display: str, url: str, rel_ids: Optional[dict] = None) -> str:
+    """w:hyperlink externo (relacionamento criado em `part`) com um run no estilo Hyperlink.
+
+    `rel_ids` (url -> rId do mesmo part) evita a varredura de relate_to em URLs repetidas.
+    """
+    r_id = rel_ids.get(url) if rel_ids is not None else None
+    if r_id is None:
+        r_id = part.relate_to(url, RT.HYPERLINK, is_external=True)
+        if rel_ids is not None:
+            rel_ids[url] = r_id
+    return '<w:hyperlink r:id="%s">%s</w:hyperlink>' % (r_id, _xml_run(display, hyperlink=True))
+
+
+def _append_ementa_runs(p, texto: str, rel_ids: Optional[dict] = None, espaco_final: bool = False):
+    """Texto da ementa no parágrafo com as URLs como hyperlinks (<url> mantém os sinais).
+
+    Runs montados como uma string XML e parseados de uma vez (um parse em C no lugar de
+    dezenas de elementos criados pelo Python). `espaco_final` acrescenta um run ' ' (ajuda
+    o Word a reconhecer URL no fim) se o texto não terminar em espaço.
+    """
+    filhos = []
+    for i, trecho in enumerate(_RE_URL_SPLIT.split(texto)):
+        if not i % 2:
+            if trecho:
+                filhos.append(_xml_run(trecho))
+        elif trecho[0] == '<':
+            url = trecho[1:-1]
+            filhos.append(_xml_run('<'))
+            filhos.append(_xml_hyperlink(p.part, url, url, rel_ids))
+            filhos.append(_xml_run('>'))
+        else:
+            filhos.append(_xml_hyperlink(p.part, trecho, trecho, rel_ids))
+    if espaco_final and texto and not texto[-1].isspace():
+        filhos.append(_xml_run(' '))
+    if filhos:
+        p._p.extend(list(parse_xml(_XML_EMENTA_WRAPPER % ''.join(filhos))))
+
+
+@functools.lru_cache(maxsize=1024)
+def _kv_linha(linha: str) -> Tuple[str, Optional[str]]:
+    """('Chave:', ' valor') para linhas 'chave: valor'; (linha, None) para texto livre.
+
+    Memoizado: linhas como 'Relator: ...' e 'Ementa:' se repetem entre os blocos.
+    """
+    key, sep, value = linha.partition(':')
+    if sep and key.strip():
+        return f"{key.strip()}:", f" {value.strip()}"
+    return linha, None
+
+
+_RE_BOOKMARK_INVALIDO = re.compile(r'[^A-Za-z0-9_]+')
+
+
+def _sanitizar_bookmark(nome: str) -> str:
+    """Nome de bookmark válido no Word: só [A-Za-z0-9_], começando por letra."""
+    base = _RE_BOOKMARK_INVALIDO.sub('_', nome or '')
+    if not base or not base[0].isalpha():
+        base = f"BM_{base}"
+    return base
+
+
+@functools.lru_cache(maxsize=256)
+def _nome_bookmark_turma(ident: str) -> str:
+    """Bookmark BM_TURMA_<ident> já sanitizado (memoizado: o identificador se repete entre os TRTs)."""
+    return _sanitizar_bookmark(f"BM_TURMA_{ident}")
+
+
+@functools.lru_cache(maxsize=256)
+def _descricao_identificador(ident: Optional[str]) -> str:
+    """Título/rótulo do sumário para o identificador do bloco (memoizado: o identificador se repete por turma)."""
+    try:
+        if not ident:
+            return 'Processo'
+        if ident == 'CSJT':
+            return 'Decisão CSJT'
+        if ident == 'Pleno':
+            return 'Decisão Tribunal Pleno'
+        if ident == 'Especial':
+            return 'Decisão Órgão Especial'
+
+        # TRT com turma (ex: TRT3_1ª, TRT24_2ª)
+        m = re.match(r'TRT(\d+)_(\d+)ª$', ident)
+        if m:
+            trt_num = m.group(1)
+            turma_num = m.group(2)
+            return f"TRT {trt_num} - {turma_num}ª Turma"
+
+        # TRT sem turma (ex: TRT3, TRT24)
+        if re.match(r'^TRT\d+$', ident):
+            num = re.search(r'\d+', ident).group()
+            return f"TRT {num} - Acórdãos"
+
+        # Turma simples (ex: 1ª, 2ª)
+        if re.match(r'^\d+ª$', ident):
+            return f"Acórdão {ident} Turma"
+
+        return 'Processo'
+    except Exception:
+        return 'Processo'
+
+
+class EmentaRecord(NamedTuple):
+    """Bloco extraído de um cartão, à espera da gravação em lote no DOCX."""
+    dados: dict
+    header_lines: List[str]
+    ementa: str
+
 
 class JTJurisTeste(BaseCase):
     def setUp(self):
@@ -44,9 +697,61 @@ class JTJurisTeste(BaseCase):
         # Estado para Word COM persistente (opcional)
         self._word_app = None
         self._word_persistent = False
+        # Último Document salvo (reaproveitado entre blocos se o arquivo não mudou)
+        self._doc_cache = None
+        # (part, url -> rId) dos hyperlinks do Document em edição
+        self._rel_id_cache = None
+        # Sumário com blocos novos ainda não atualizado (feito uma vez por TRT)
+        self._pending_sumario = False
+        # EmentaRecords da turma atual, gravados de uma vez no DOCX
+        self._turma_buffer = []
+        # Document com blocos ainda não salvos; save a cada JT_SAVE_EVERY blocos (e no fim)
+        self._doc_pendente = None
+        self._pending_writes = 0
+        self._save_every = _ler_save_every()
+        self._toc_update_mode = _ler_toc_update_mode()
         # Flags de ambiente para estabilidade
         self.skip_sumario = os.environ.get("JT_SKIP_SUMARIO", "0") == "1"
         self.disable_clipboard = os.environ.get("JT_DISABLE_CLIPBOARD", "0") == "1"
+        self.ementa_dom = os.environ.get("JT_EMENTA_DOM", "0") == "1"
+        self.ementa_dom_check = _ler_ementa_dom_check()
+        self._preparar_xpaths()
+
+    def tearDown(self):
+        # Blocos pendentes, sumário final e Word fechado mesmo se o teste falhar
+        self._finalizar_docx()
+        super().tearDown()
+
+    def _finalizar_docx(self):
+        """Fim da execução (tearDown ou finally sem pytest): grava os blocos ainda em memória,
+        atualiza o sumário se há blocos novos desde a última atualização e fecha o Word."""
+        try:
+            self._flush_docx()
+        except Exception:
+            pass
+        docx_path = getattr(self, '_docx_real_path', None) or getattr(self, '_docx_path', None)
+        if docx_path and getattr(self, '_pending_sumario', False):
+            self._atualizar_sumario_final(docx_path)
+        if getattr(self, '_word_app', None):
+            self._close_word_app()
+            logger.info("Aplicação Word encerrada com sucesso.")
+
+    def _atualizar_sumario_final(self, docx_path: str):
+        """Única repaginação com o documento completo: entradas PAGEREF pendentes + Word COM."""
+        if getattr(self, 'skip_sumario', False):
+            return
+        self._flush_docx()
+        try:
+            if getattr(self, '_pending_sumario', False):
+                logger.info("📖 Atualizando sumário com o documento completo...")
+                try:
+                    self._atualizar_sumario_com_pageref(docx_path, self._turma_bookmarks)
+                except Exception as e1:
+                    logger.debug(f"Falha ao inserir PAGEREF: {e1}")
+                self._pending_sumario = False
+            self._atualizar_sumario_win32(docx_path)
+        except Exception as e:
+            logger.warning(f"Atualização final do sumário falhou: {e}")
 
     def _load_selectors(self, caminho='selectors_jt.json'):
         try:
@@ -56,13 +761,74 @@ class JTJurisTeste(BaseCase):
             logger.error(f"Erro ao carregar seletores JT: {e}")
             return {"jt": {}}
 
+    def _preparar_xpaths(self):
+        """Resolve uma vez os seletores de resultados usados nos laços por cartão.
+
+        Guarda as listas (_sel_*) e as uniões '|' pré-montadas (_xp_*: uma consulta em vez de N).
+        """
+        sel = self.selectors.get('jt', {}).get('resultados', {})
+
+        def lista(chave):
+            caminhos = sel.get(chave) or []
+            if isinstance(caminhos, str):
+                caminhos = [caminhos]
+            return [xp for xp in caminhos if xp and xp.strip()]
+
+        def uniao(caminhos):
+            return " | ".join(xp.strip() for xp in caminhos) or None
+
+        self._sel_res = sel
+        self._sel_paginacao = sel.get('paginacao', {}) or {}
+        self._sel_cartao_root = lista('cartao_root')
+        self._sel_cabecalho_section = lista('cabecalho_section')
+        self._sel_header_fb = lista('header_section_fallback')
+        self._xp_cartao_root = uniao(self._sel_cartao_root)
+        self._xp_cabecalho = uniao(self._sel_cabecalho_section)
+        self._xp_cabecalho_linhas = sel.get('cabecalho_linhas', ".//div[contains(@class,'doc-texto') ]")
+        self._xp_header_fb = uniao(self._sel_header_fb)
+        # Nó da ementa dentro do cartão (JT_EMENTA_DOM); sem ele usa o cartão inteiro + marcador 'Ementa:'
+        self._xp_ementa_texto = (sel.get('ementa_texto') or '').strip() or None
+        self._xp_remove_trt = _XP_REMOVE_TRT
+
+    def _visiveis(self, uniao: Optional[str], caminhos) -> List:
+        """Elementos visíveis da união (contexto: documento) filtrados no navegador em uma chamada.
+
+        Se a união faltar ou o JS falhar, volta a _find_uniao + is_displayed() por elemento.
+        """
+        if uniao:
+            try:
+                return self.driver.execute_script(_JS_VISIVEIS_XPATH, uniao) or []
+            except Exception as e:
+                logger.debug("Filtro de visibilidade via JS falhou: %s", e)
+        vis = []
+        for e in self._find_uniao(uniao, caminhos):
+            try:
+                if e.is_displayed():
+                    vis.append(e)
+            except Exception:
+                continue
+        return vis
+
+    def _find_uniao(self, uniao: Optional[str], caminhos, ctx=None) -> List:
+        """find_elements com a união '|' pré-montada; se ela faltar ou falhar, consulta caminho a caminho."""
+        ctx = self.driver if ctx is None else ctx
+        if uniao:
+            try:
+                return ctx.find_elements(By.XPATH, uniao)
+            except Exception as e:
+                logger.debug("União XPath falhou, consultando caminho a caminho: %s", e)
+        elems = []
+        for xp in caminhos or []:
+            try:
+                elems.extend(ctx.find_elements(By.XPATH, xp))
+            except Exception:
+                continue
+        return elems
+
     # ---------- Sumário e Bookmarks ----------
     def _sanitizar_nome_bookmark(self, nome: str) -> str:
         try:
-            base = re.sub(r'[^A-Za-z0-9_]+', '_', nome or '')
-            if not base or not base[0].isalpha():
-                base = f"BM_{base}"
-            return base
+            return _sanitizar_bookmark(nome)
         except Exception:
             return "BM_FALLBACK"
 
@@ -119,35 +885,38 @@ class JTJurisTeste(BaseCase):
             return None
 
     def _descricao_por_identificador(self, ident: Optional[str]) -> str:
-        try:
-            if not ident:
-                return 'Processo'
-            if ident == 'CSJT':
-                return 'Decisão CSJT'
-            if ident == 'Pleno':
-                return 'Decisão Tribunal Pleno'
-            if ident == 'Especial':
-                return 'Decisão Órgão Especial'
-
-            # TRT com turma (ex: TRT3_1ª, TRT24_2ª)
-            m = re.match(r'TRT(\d+)_(\d+)ª$', ident)
-            if m:
-                trt_num = m.group(1)
-                turma_num = m.group(2)
-                return f"TRT {trt_num} - {turma_num}ª Turma"
+        return _descricao_identificador(ident)
 
-            # TRT sem turma (ex: TRT3, TRT24)
-            if re.match(r'^TRT\d+$', ident):
-                num = re.search(r'\d+', ident).group()
-                return f"TRT {num} - Acórdãos"
+    def _ensure_sumario_inplace(self, doc: Document):
+        """Garante o parágrafo 'Sumário' no documento em memória (sem salvar).
 
-            # Turma simples (ex: 1ª, 2ª)
-            if re.match(r'^\d+ª$', ident):
-                return f"Acórdão {ident} Turma"
-
-            return 'Processo'
-        except Exception:
-            return 'Processo'
+        Retorna o resultado de _buscar_sumario_em_documento (None se não foi possível).
+        """
+        si = self._buscar_sumario_em_documento(doc)
+        if si:
+            return si
+        primeiro = doc.paragraphs[0] if doc.paragraphs else None
+        if primeiro is not None:
+            p = primeiro.insert_paragraph_before('Sumário')
+        else:
+            p = doc.add_paragraph('Sumário')
+        # formatar
+        if p.runs:
+            for r in p.runs:
+                r.bold = True
+                r.font.name = _ARIAL
+                r.font.size = Pt(9)
+        else:
+            run = p.add_run('Sumário')
+            run.bold = True
+            run.font.name = _ARIAL
+            run.font.size = Pt(9)
+        # Parágrafo vazio logo após o 'Sumário' (python-docx não tem insert_paragraph_after)
+        if primeiro is not None:
+            primeiro.insert_paragraph_before('')
+        else:
+            doc.add_paragraph('')
+        return self._buscar_sumario_em_documento(doc)
 
     def _prepare_document_with_sumario(self, doc_path: str) -> Document:
         try:
@@ -157,30 +926,123 @@ class JTJurisTeste(BaseCase):
                 # Criar novo doc vazio
                 doc = Document()
             # Garantir que exista 'Sumário'
-            si = self._buscar_sumario_em_documento(doc)
-            if not si:
-                if doc.paragraphs:
-                    p = doc.paragraphs[0].insert_paragraph_before('Sumário')
-                else:
-                    p = doc.add_paragraph('Sumário')
-                # formatar
-                if p.runs:
-                    for r in p.runs:
-                        r.bold = True
-                        r.font.name = 'Arial MT'
-                        r.font.size = Pt(9)
-                else:
-                    run = p.add_run('Sumário')
-                    run.bold = True
-                    run.font.name = 'Arial MT'
-                    run.font.size = Pt(9)
-                p.insert_paragraph_after('')
+            self._ensure_sumario_inplace(doc)
             # Salvar estado
             doc.save(doc_path)
             return doc
         except Exception:
             return Document(doc_path) if os.path.exists(doc_path) else Document()
 
+    def _assinatura_docx(self, doc_path: str):
+        """(mtime_ns, tamanho) do arquivo, ou None se não existir."""
+        try:
+            st = os.stat(doc_path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _carregar_docx(self, doc_path: str) -> Document:
+        """Reaproveita o Document do último save se o arquivo não mudou desde então.
+
+        Qualquer alteração externa (Word COM, atualização do sumário) muda a assinatura
+        do arquivo e força uma nova leitura. O cache é consumido: volta só após novo save.
+        """
+        cache = getattr(self, '_doc_cache', None)
+        self._doc_cache = None
+        atual = self._assinatura_docx(doc_path)  # também serve de teste de existência
+        if cache:
+            caminho, assinatura, doc = cache
+            if atual is not None and assinatura == atual and caminho == os.path.abspath(doc_path):
+                return doc
+        return Document(doc_path) if atual is not None else Document()
+
+    def _rel_ids_do_part(self, part) -> dict:
+        """Cache url -> rId de hyperlink do part; recomeça quando o Document muda."""
+        cache = getattr(self, '_rel_id_cache', None)
+        if cache is None or cache[0] is not part:
+            cache = (part, {})
+            self._rel_id_cache = cache
+        return cache[1]
+
+    def _registrar_docx_salvo(self, doc_path: str, doc: Document):
+        """Guarda o Document recém-salvo para reuso; retorna a assinatura (mtime_ns, tamanho)."""
+        assinatura = self._assinatura_docx(doc_path)
+        self._doc_cache = (os.path.abspath(doc_path), assinatura, doc)
+        return assinatura
+
+    def _mesclar_docx_parciais(self, doc_path: str, parciais: List[Tuple[str, dict]]) -> dict:
+        """Copia os blocos (tudo antes do 'Sumário') de cada DOCX parcial para doc_path, na ordem dada.
+
+        `parciais` traz (caminho, ident -> bookmark) de cada processo. Hyperlinks ganham
+        relacionamentos no documento final, bookmarks são renumerados e nomes repetidos
+        recebem sufixo. Atualiza e retorna self._turma_bookmarks.
+        """
+        doc = self._carregar_docx(doc_path)
+        suminfo = self._ensure_sumario_inplace(doc)
+        if not suminfo:
+            logger.error("Não foi possível localizar o 'Sumário' no DOCX final; mesclagem cancelada.")
+            return self._turma_bookmarks
+        anchor = suminfo['elemento']._p
+        # Os parágrafos copiados referenciam o estilo dos blocos pelo id
+        self._garantir_estilo_ementa(doc)
+        body = doc.element.body
+        nomes = set()
+        for bm in body.iter(qn('w:bookmarkStart')):
+            nomes.add(bm.get(qn('w:name')))
+            try:
+                self._bookmark_id_counter = max(self._bookmark_id_counter, int(bm.get(qn('w:id'))))
+            except (TypeError, ValueError):
+                pass
+        for caminho, bookmarks in parciais:
+            if not caminho or not os.path.exists(caminho):
+                logger.warning(f"⚠ DOCX parcial ausente, ignorado: {caminho}")
+                continue
+            try:
+                origem = Document(caminho)
+            except Exception as e:
+                logger.error(f"Erro ao abrir DOCX parcial {caminho}: {e}")
+                continue
+            sum_origem = self._buscar_sumario_em_documento(origem)
+            fim = sum_origem['elemento']._p if sum_origem else None
+            rels = origem.part.rels
+            ids_bm = {}
+            renomeados = {}
+            copiados = 0
+            for el in list(origem.element.body):
+                if el is fim:
+                    break
+                if el.tag == qn('w:sectPr'):
+                    continue
+                novo = copy.deepcopy(el)
+                for hl in novo.iter(qn('w:hyperlink')):
+                    r_id = hl.get(qn('r:id'))
+                    if r_id and r_id in rels:
+                        hl.set(qn('r:id'), doc.part.relate_to(rels[r_id].target_ref, RT.HYPERLINK, is_external=True))
+                for bm in novo.iter(qn('w:bookmarkStart'), qn('w:bookmarkEnd')):
+                    antigo = bm.get(qn('w:id'))
+                    if antigo not in ids_bm:
+                        self._bookmark_id_counter += 1
+                        ids_bm[antigo] = str(self._bookmark_id_counter)
+                    bm.set(qn('w:id'), ids_bm[antigo])
+                    nome = bm.get(qn('w:name'))
+                    if nome is None:
+                        continue
+                    novo_nome, n = nome, 2
+                    while novo_nome in nomes:
+                        novo_nome, n = f"{nome}_{n}", n + 1
+                    if novo_nome != nome:
+                        renomeados[nome] = novo_nome
+                        bm.set(qn('w:name'), novo_nome)
+                    nomes.add(novo_nome)
+                anchor.addprevious(novo)
+                copiados += 1
+            for ident, bm_name in (bookmarks or {}).items():
+                self._turma_bookmarks.setdefault(ident, renomeados.get(bm_name, bm_name))
+            logger.info(f"🔗 {copiados} elemento(s) mesclados de {os.path.basename(caminho)}")
+        doc.save(doc_path)
+        self._registrar_docx_salvo(doc_path, doc)
+        return self._turma_bookmarks
+
     def _buscar_sumario_em_documento(self, doc: Document):
         try:
             for i, p in enumerate(doc.paragraphs):
@@ -188,7 +1050,7 @@ class JTJurisTeste(BaseCase):
                 # normalizar (remover acentos) e comparar de forma robusta
                 norm = unicodedata.normalize('NFD', txt)
                 norm = ''.join(c for c in norm if unicodedata.category(c) != 'Mn')
-                norm = re.sub(r'\s+', ' ', norm).strip().lower()
+                norm = _RE_WS.sub(" ", norm).strip().lower()
                 if 'sumario' == norm or norm.startswith('sumario'):
                     return {'tipo': 'paragrafo', 'indice': i, 'elemento': p}
             return None
@@ -234,13 +1096,13 @@ class JTJurisTeste(BaseCase):
         try:
             novo_para = sumario_para.insert_paragraph_after('')
             run = novo_para.add_run(f"{label}")
-            run.font.name = 'Arial MT'
+            run.font.name = _ARIAL
             run.font.size = Pt(9)
             # espaçamento com tabs simples
             novo_para.add_run('\t')
             if pagina is not None:
                 pr = novo_para.add_run(str(pagina))
-                pr.font.name = 'Arial MT'
+                pr.font.name = _ARIAL
                 pr.font.size = Pt(9)
             return novo_para
         except Exception:
@@ -250,7 +1112,7 @@ class JTJurisTeste(BaseCase):
         try:
             novo_para = sumario_para.insert_paragraph_after('')
             run = novo_para.add_run(f"{label}\t")
-            run.font.name = 'Arial MT'
+            run.font.name = _ARIAL
             run.font.size = Pt(9)
             fld = OxmlElement('w:fldSimple')
             fld.set(qn('w:instr'), f"PAGEREF {bookmark_name} \\h")
@@ -277,6 +1139,12 @@ class JTJurisTeste(BaseCase):
             import win32com.client as win32
             try:
                 word = win32.GetActiveObject('Word.Application')
+                # GetActiveObject devolve IDispatch late-bound; os wrappers do makepy (early
+                # binding) evitam um GetIDsOfNames a cada acesso de atributo/método
+                try:
+                    word = win32.gencache.EnsureDispatch(word._oleobj_)
+                except Exception:
+                    pass
             except Exception:
                 word = win32.gencache.EnsureDispatch('Word.Application')
 
@@ -298,10 +1166,16 @@ class JTJurisTeste(BaseCase):
             return word
 
         except AttributeError:
+            # Cache gen_py corrompido: apaga e regenera os wrappers early-bound;
+            # late binding (Dispatch) só como último recurso
             try:
-                import shutil, tempfile, win32com.client as win32
-                shutil.rmtree(os.path.join(tempfile.gettempdir(), 'gen_py'), ignore_errors=True)
-                word = win32.Dispatch('Word.Application')
+                import shutil, tempfile, win32com, win32com.client as win32
+                gen_path = getattr(win32com, '__gen_path__', None) or os.path.join(tempfile.gettempdir(), 'gen_py')
+                shutil.rmtree(gen_path, ignore_errors=True)
+                try:
+                    word = win32.gencache.EnsureDispatch('Word.Application')
+                except Exception:
+                    word = win32.Dispatch('Word.Application')
                 try:
                     word.Visible = False
                     word.DisplayAlerts = 0
@@ -386,7 +1260,7 @@ class JTJurisTeste(BaseCase):
                     pass
         except Exception as e:
             logger.error(f"Erro ao ler páginas via Word COM: {e}")
-            logger.debug(traceback.format_exc())
+            logger.debug("Traceback da leitura de páginas via Word COM", exc_info=True)
             paginas = {name: None for name in bookmark_names}
         return paginas
         return paginas
@@ -831,7 +1705,7 @@ class JTJurisTeste(BaseCase):
         try:
             novo_para = sumario_para.insert_paragraph_after('')
             run = novo_para.add_run(entrada)
-            run.font.name = 'Arial MT'
+            run.font.name = _ARIAL
             run.font.size = Pt(9)
 
             # Configurar tab stop com pontos
@@ -1162,7 +2036,7 @@ class JTJurisTeste(BaseCase):
         Retorna True em caso de sucesso; se falhar, loga e retorna False sem interromper o fluxo."""
         try:
             import subprocess, sys
-            updater = os.path.join(os.path.dirname(__file__), 'word_toc_updater.py')
+            updater = str(_MODULE_DIR / 'word_toc_updater.py')
             if not os.path.exists(updater):
                 logger.warning("Helper 'word_toc_updater.py' não encontrado; pulando atualização COM externa.")
                 return False
@@ -1217,7 +2091,11 @@ class JTJurisTeste(BaseCase):
 
     def _hover(self, el):
         try:
-            ActionChains(self.driver).move_to_element(el).perform()
+            ac = ActionChains(self.driver)
+            try:
+                ac.move_to_element(el).perform()
+            finally:
+                ac.reset_actions()
         except Exception:
             pass
 
@@ -1256,7 +2134,7 @@ class JTJurisTeste(BaseCase):
         except Exception:
             return None
 
-    def _scroll_node_to_bottom(self, node, tries: int = 3):
+    def _scroll_node_to_bottom(self, node, tries: int = 3, pausa: float = 0.35):
         for _ in range(max(1, tries)):
             try:
                 if node is not None and node.tag_name.lower() not in ('html','body'):
@@ -1265,9 +2143,45 @@ class JTJurisTeste(BaseCase):
                     self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             except Exception:
                 pass
-            time.sleep(0.35)
+            if pausa:
+                time.sleep(pausa)
+
+    def _aguardar_dom_estavel(self, silencio: float = 0.15, timeout: float = 0.35, minimo: float = 0.1) -> bool:
+        """Polling (50ms) da marca do MutationObserver até o DOM ficar `silencio` s sem mudanças.
+
+        O silêncio só conta a partir da primeira mudança vista após o scroll; sem mudança, espera
+        até `timeout` (a pausa fixa antiga, pior caso igual ao anterior). Retorna False se o
+        observer não estiver disponível (o chamador usa pausa fixa).
+        """
+        try:
+            if not self.driver.execute_script(_JS_INSTALAR_OBSERVER):
+                return False
+        except Exception:
+            return False
+        inicio = time.monotonic()
+        fim = inicio + timeout
+        ultima_mudanca = None
+        while True:
+            agora = time.monotonic()
+            if agora >= fim:
+                return True
+            if ultima_mudanca is not None and agora - inicio >= minimo and agora - ultima_mudanca >= silencio:
+                return True
+            time.sleep(0.05)
+            try:
+                if self.driver.execute_script(_JS_CONSUMIR_DOM_DIRTY):
+                    ultima_mudanca = time.monotonic()
+            except Exception:
+                return False
 
     def _reveal_all_cards_on_page(self, max_scrolls: int = 20, settle_cycles: int = 2) -> int:
+        # Observer instalado antes do primeiro scroll para capturar o carregamento que ele dispara
+        try:
+            observer = bool(self.driver.execute_script(_JS_INSTALAR_OBSERVER))
+            if observer:
+                self.driver.execute_script(_JS_CONSUMIR_DOM_DIRTY)
+        except Exception:
+            observer = False
         prev = -1
         stable = 0
         scrolls = 0
@@ -1288,14 +2202,17 @@ class JTJurisTeste(BaseCase):
             if target is not None:
                 self._scroll_center(target)
                 container = self._find_scrollable_ancestor(target)
-            self._scroll_node_to_bottom(container, tries=1)
+            # Com o observer, espera o DOM parar de crescer em vez da pausa fixa de 0.35s
+            self._scroll_node_to_bottom(container, tries=1, pausa=0 if observer else 0.35)
+            if observer and not self._aguardar_dom_estavel():
+                time.sleep(0.35)
             scrolls += 1
         return prev if prev >= 0 else 0
 
     def _ajustar_itens_por_pagina(self, valor: str = '10') -> bool:
         try:
             logger.info(f"📊 Configurando paginação para {valor} itens por página...")
-            sel_pag = self.selectors.get('jt', {}).get('resultados', {}).get('paginacao', {})
+            sel_pag = self._sel_paginacao
             labels = sel_pag.get('rows_dropdown_label', [])
             opts10 = sel_pag.get('rows_option_10', [])
 
@@ -1490,7 +2407,7 @@ class JTJurisTeste(BaseCase):
 
     def _find_next_page_button(self):
         try:
-            pag = self.selectors.get('jt', {}).get('resultados', {}).get('paginacao', {})
+            pag = self._sel_paginacao
             # Dentro do container
             containers = []
             for xp in pag.get('paginator_container', []) or []:
@@ -1569,7 +2486,7 @@ class JTJurisTeste(BaseCase):
             # Procurar containers do paginator
             containers = []
             try:
-                for xp in (self.selectors.get('jt', {}).get('resultados', {}).get('paginacao', {}).get('paginator_container', []) or []):
+                for xp in (self._sel_paginacao.get('paginator_container', []) or []):
                     try:
                         cs = self.driver.find_elements(By.XPATH, xp)
                         containers.extend([c for c in cs if (c.is_displayed() if hasattr(c,'is_displayed') else True)])
@@ -1613,7 +2530,7 @@ class JTJurisTeste(BaseCase):
             self._scroll_to_bottom(tries=2)
             containers = []
             try:
-                for xp in (self.selectors.get('jt', {}).get('resultados', {}).get('paginacao', {}).get('paginator_container', []) or []):
+                for xp in (self._sel_paginacao.get('paginator_container', []) or []):
                     try:
                         cs = self.driver.find_elements(By.XPATH, xp)
                         containers.extend([c for c in cs if (c.is_displayed() if hasattr(c,'is_displayed') else True)])
@@ -1790,7 +2707,7 @@ class JTJurisTeste(BaseCase):
             return None
 
     def _find_copy_element(self, card):
-        sel = self.selectors.get('jt', {}).get('resultados', {})
+        sel = self._sel_res
 
         # DEBUG: Verifica se é modo debug
         debug_mode = os.environ.get("JT_DEBUG_COPY", "0") == "1"
@@ -1921,26 +2838,91 @@ class JTJurisTeste(BaseCase):
         except Exception:
             return False
 
+    @contextlib.contextmanager
+    def _sem_implicit_wait(self):
+        """Aplica _IMPLICIT_WAIT_SONDAGEM durante o bloco e restaura o implicit wait anterior."""
+        try:
+            anterior = self.driver.timeouts.implicit_wait
+        except Exception:
+            anterior = getattr(self, '_implicit_wait', 0)
+        try:
+            self.driver.implicitly_wait(_IMPLICIT_WAIT_SONDAGEM)
+        except Exception:
+            pass
+        try:
+            yield
+        finally:
+            try:
+                self.driver.implicitly_wait(anterior or 0)
+            except Exception:
+                pass
+
+    def _span_e_pai(self, xp: str):
+        """Retorna (span, pai) do primeiro nó de `xp` em uma única chamada JS, ou None."""
+        try:
+            par = self.driver.execute_script(
+                "var r = document.evaluate(arguments[0], document, null, 9, null).singleNodeValue;"
+                "return r ? [r, r.parentElement || r] : null;",
+                xp,
+            )
+            return (par[0], par[1]) if par else None
+        except Exception:
+            return None
+
+    def _filtro_marcado(self, elemento) -> bool:
+        """Verifica se um filtro/checkbox está marcado (uma única chamada JS)."""
+        try:
+            return bool(self.driver.execute_script(_JS_FILTRO_MARCADO, elemento))
+        except Exception:
+            return False
+
+    def _is_marcado(self, el) -> bool:
+        """Relê o estado de um elemento já localizado (uma chamada JS, sem novo find_elements).
+
+        Propaga StaleElementReferenceException para que o chamador relocalize o item.
+        """
+        try:
+            return bool(self.driver.execute_script(_JS_FILTRO_MARCADO, el))
+        except StaleElementReferenceException:
+            raise
+        except Exception:
+            return False
+
+    def _ensure_checked(self, xp: str, label: str, retries: int = 3) -> bool:
+        """Garante que o filtro localizado por `xp` esteja marcado.
+
+        Não clica se já estiver marcado; após cada clique aguarda a mudança de estado
+        com WebDriverWait em vez de uma pausa fixa.
+        """
+        try:
+            els = self.driver.find_elements(By.XPATH, xp)
+        except Exception:
+            els = []
+        if not els:
+            logger.warning(f"    ⚠ '{label}' não encontrado")
+            return False
+        el = els[0]
+        if self._filtro_marcado(el):
+            logger.info(f"    ✓ '{label}' já marcado")
+            return True
+        for tentativa in range(retries):
+            self._scroll_center(el)
+            self._safe_js_click(el)
+            try:
+                WebDriverWait(self.driver, 2, poll_frequency=0.1).until(lambda _d: self._filtro_marcado(el))
+                logger.info(f"    ✓ '{label}' marcado com sucesso")
+                return True
+            except TimeoutException:
+                logger.warning(f"    ⚠ Tentativa {tentativa+1}: '{label}' não marcou")
+        return False
+
     def _wait_results_loaded(self, timeout=30) -> bool:
         inicio = time.time()
         last_vis_count = -1
         stable = 0
-        sel = self.selectors.get('jt', {}).get('resultados', {})
-        cartao_paths = sel.get('cartao_root', [])
+        find_elements = self.driver.find_elements
         while time.time() - inicio < timeout:
-            vis = []
-            for xp in cartao_paths:
-                try:
-                    elems = self.driver.find_elements(By.XPATH, xp)
-                    for e in elems:
-                        try:
-                            if e.is_displayed():
-                                vis.append(e)
-                        except Exception:
-                            continue
-                except Exception:
-                    continue
-            count = len(vis)
+            count = len(self._visiveis(self._xp_cartao_root, self._sel_cartao_root))
             if count == last_vis_count:
                 stable += 1
             else:
@@ -1948,7 +2930,7 @@ class JTJurisTeste(BaseCase):
                 last_vis_count = count
             # Checa spinners
             try:
-                spinners = self.driver.find_elements(By.XPATH, "//*[contains(@class,'spinner') or contains(@class,'progress') or contains(@class,'CircularProgress')]")
+                spinners = find_elements(By.XPATH, "//*[contains(@class,'spinner') or contains(@class,'progress') or contains(@class,'CircularProgress')]")
             except Exception:
                 spinners = []
             if stable >= 2 and (count > 0 or (time.time() - inicio) > 5) and not spinners:
@@ -1958,6 +2940,35 @@ class JTJurisTeste(BaseCase):
         logger.warning("Timeout aguardando resultados.")
         return False
 
+    def _primeiro_cartao(self):
+        """Primeiro cartão da lista atual (referência para detectar a troca dos resultados)."""
+        xp = self._xp_cartao_root
+        if not xp:
+            return None
+        try:
+            els = self.driver.find_elements(By.XPATH, xp)
+            return els[0] if els else None
+        except Exception:
+            return None
+
+    def _aguardar_novos_resultados(self, anterior, timeout: float = 25) -> bool:
+        """Aguarda a lista ser substituída após trocar um filtro, em vez de uma pausa fixa.
+
+        O cartão `anterior` ficar stale (no máximo 5s: a lista pode ser atualizada no lugar)
+        só antecipa a checagem; quem confirma a lista final é _wait_results_loaded (contagem
+        estável e sem spinner). A desmarcação do filtro anterior também recarrega a lista,
+        então o stale sozinho pode vir do resultado intermediário.
+        """
+        fim = time.monotonic() + timeout
+        if anterior is not None:
+            try:
+                WebDriverWait(self.driver, min(timeout, 5.0), poll_frequency=0.2).until(EC.staleness_of(anterior))
+            except TimeoutException:
+                logger.debug("Lista de resultados não foi substituída; seguindo")
+            except Exception:
+                pass
+        return self._wait_results_loaded(max(1.0, fim - time.monotonic()))
+
     def _expandir_mais_tribunais(self, max_clicks=5) -> bool:
         """Clica em 'Mais...' para revelar mais tribunais (ex.: TRT24)."""
         filtros = self.selectors.get('jt', {}).get('filtros', {})
@@ -2030,6 +3041,8 @@ class JTJurisTeste(BaseCase):
         xp_acordaos = filtros.get('acordaos')
         xp_com_ementa = filtros.get('com_ementa')
         xp_tribunal_tmpl = filtros.get('tribunal_label')
+        xp_turma_tmpl = filtros.get('turma_label') or filtros.get('orgao_julgante_turma_label')
+        xp_mais_turmas = filtros.get('mais_turmas')
 
         # Helpers locais para seleção estável
         def verificar_filtro_marcado(elemento, debug: bool = False) -> bool:
@@ -2044,48 +3057,9 @@ class JTJurisTeste(BaseCase):
                     logger.info(f"    [DEBUG] aria-checked: {aria_checked}")
                     logger.info(f"    [DEBUG] aria-selected: {aria_selected}")
 
-                # Verifica por atributos comuns de estado marcado
-                aria_checked = elemento.get_attribute('aria-checked')
-                if aria_checked == 'true':
-                    return True
-
-                aria_selected = elemento.get_attribute('aria-selected')
-                if aria_selected == 'true':
-                    return True
-
-                # Verifica classes que indicam seleção (PrimeNG usa p-highlight)
-                classes = elemento.get_attribute('class') or ''
-                marcadores = ['selected', 'checked', 'active', 'p-highlight', 'p-checked', 'selecionado']
-                if any(x in classes for x in marcadores):
-                    return True
-
-                # Verifica elemento pai (às vezes a classe está no pai)
-                try:
-                    pai = elemento.find_element(By.XPATH, "..")
-                    classes_pai = pai.get_attribute('class') or ''
-                    if any(x in classes_pai for x in marcadores):
-                        return True
-                except:
-                    pass
-
-                # Verifica input checkbox dentro do elemento
-                try:
-                    checkbox = elemento.find_element(By.XPATH, ".//input[@type='checkbox']")
-                    if checkbox.is_selected():
-                        return True
-                except:
-                    pass
-
-                # Verifica checkbox no elemento pai
-                try:
-                    pai = elemento.find_element(By.XPATH, "..")
-                    checkbox_pai = pai.find_element(By.XPATH, ".//input[@type='checkbox']")
-                    if checkbox_pai.is_selected():
-                        return True
-                except:
-                    pass
-
-                return False
+                # aria-checked/aria-selected, classes do elemento e do pai (PrimeNG usa
+                # p-highlight) e checkbox interno — tudo em uma única chamada JS
+                return self._filtro_marcado(elemento)
             except Exception as e:
                 if debug:
                     logger.warning(f"    [DEBUG] Erro verificando: {e}")
@@ -2094,59 +3068,14 @@ class JTJurisTeste(BaseCase):
         def aplicar_filtros_basicos():
             logger.info("📋 Aplicando filtros básicos...")
 
-            # Filtro Acórdãos
-            if xp_acordaos:
-                logger.info("  🔍 Aplicando filtro 'Acórdãos'...")
-                for tentativa in range(3):
-                    try:
-                        btns = self.driver.find_elements(By.XPATH, xp_acordaos)
-                        if btns:
-                            btn = btns[0]
-                            # Verifica se já está marcado
-                            if verificar_filtro_marcado(btn):
-                                logger.info("    ✓ 'Acórdãos' já marcado")
-                                break
-
-                            self._scroll_center(btn)
-                            self._safe_js_click(btn)
-                            time.sleep(0.8)
-
-                            # Verifica se marcou
-                            if verificar_filtro_marcado(btn):
-                                logger.info("    ✓ 'Acórdãos' marcado com sucesso")
-                                break
-                            else:
-                                logger.warning(f"    ⚠ Tentativa {tentativa+1}: 'Acórdãos' não marcou")
-                    except Exception as e:
-                        logger.debug(f"    Erro na tentativa {tentativa+1}: {e}")
-                        time.sleep(0.5)
-
-            # Filtro Com Ementa
-            if xp_com_ementa:
-                logger.info("  🔍 Aplicando filtro 'Com Ementa'...")
-                for tentativa in range(3):
-                    try:
-                        btns_ce = self.driver.find_elements(By.XPATH, xp_com_ementa)
-                        if btns_ce:
-                            btn_ce = btns_ce[0]
-                            # Verifica se já está marcado
-                            if verificar_filtro_marcado(btn_ce):
-                                logger.info("    ✓ 'Com Ementa' já marcado")
-                                break
-
-                            self._scroll_center(btn_ce)
-                            self._safe_js_click(btn_ce)
-                            time.sleep(0.8)
-
-                            # Verifica se marcou
-                            if verificar_filtro_marcado(btn_ce):
-                                logger.info("    ✓ 'Com Ementa' marcado com sucesso")
-                                break
-                            else:
-                                logger.warning(f"    ⚠ Tentativa {tentativa+1}: 'Com Ementa' não marcou")
-                    except Exception as e:
-                        logger.debug(f"    Erro na tentativa {tentativa+1}: {e}")
-                        time.sleep(0.5)
+            for xp_filtro, label in ((xp_acordaos, 'Acórdãos'), (xp_com_ementa, 'Com Ementa')):
+                if not xp_filtro:
+                    continue
+                logger.info(f"  🔍 Aplicando filtro '{label}'...")
+                try:
+                    self._ensure_checked(xp_filtro, label, retries=3)
+                except Exception as e:
+                    logger.debug(f"    Erro aplicando filtro '{label}': {e}")
 
             logger.info("✅ Filtros básicos aplicados")
 
@@ -2372,7 +3301,7 @@ class JTJurisTeste(BaseCase):
 
             except Exception as e:
                 logger.error(f"    ❌ Erro crítico ao desmarcar turmas: {e}")
-                logger.debug(traceback.format_exc())
+                logger.debug("Traceback da desmarcação de turmas", exc_info=True)
                 resultado['erros'].append(f"Erro crítico: {str(e)}")
                 return resultado
 
@@ -2456,12 +3385,12 @@ class JTJurisTeste(BaseCase):
                 return False
             except Exception as e:
                 logger.error(f"  ❌ Erro selecionando {sigla}: {e}")
-                logger.debug(traceback.format_exc())
+                logger.debug("Traceback da seleção de %s", sigla, exc_info=True)
                 return False
 
         def expandir_lista_turmas(max_tentativas: int = 3) -> bool:
             """Expande a lista de turmas clicando em 'Mais...'"""
-            mais_paths = filtros.get('mais_turmas')
+            mais_paths = xp_mais_turmas
             if not mais_paths:
                 return False
 
@@ -2509,6 +3438,10 @@ class JTJurisTeste(BaseCase):
             return expansoes_realizadas > 0
 
         def selecionar_turma(nome: str, tentar_expandir: bool = True) -> bool:
+            with self._sem_implicit_wait():
+                return _selecionar_turma(nome, tentar_expandir)
+
+        def _selecionar_turma(nome: str, tentar_expandir: bool = True) -> bool:
             logger.info(f"  📋 Selecionando turma '{nome}'...")
 
             # Primeiro desmarca a turma atual
@@ -2522,115 +3455,102 @@ class JTJurisTeste(BaseCase):
             else:
                 time.sleep(0.3)
 
-            # Helper local: variantes do rótulo (com e sem zero à esquerda)
-            def _variantes_turma_label_local(txt: str):
+            labels = _variantes_turma_label(nome)
+            # Tupla cacheada por (nome, template): reaproveitada em todas as tentativas
+            candidatos = _candidatos_turma(nome, xp_turma_tmpl)
+
+            xp_union = _xpath_uniao(candidatos)
+
+            def localizar_turma(xpaths, uniao=None):
+                """Resolve todos os candidatos em uma única chamada JS.
+
+                Retorna dict com 'span', 'item' (pai clicável), 'xpath', 'indice' e 'marcado', ou None.
+                """
                 try:
-                    s = re.sub(r"\s+", " ", (txt or "").strip())
-                    variantes = [s]
-                    m = re.match(r"^(\d+)\s*ª\s*Turma$", s, flags=re.IGNORECASE)
-                    if m:
-                        num = m.group(1)
-                        no_zero = str(int(num))
-                        zero2 = str(num).zfill(2)
-                        for v in (f"{no_zero}ª Turma", f"{zero2}ª Turma"):
-                            if v not in variantes:
-                                variantes.append(v)
-                    # único mantendo ordem
-                    seen = set()
-                    uniq = []
-                    for v in variantes:
-                        if v not in seen:
-                            uniq.append(v)
-                            seen.add(v)
-                    return uniq
-                except Exception:
-                    return [txt]
+                    return self.driver.execute_script(_JS_PRIMEIRO_VISIVEL, list(xpaths), uniao)
+                except Exception as e:
+                    logger.debug("    Erro ao localizar candidatos de turma: %s", e)
+                    return None
 
-            labels = _variantes_turma_label_local(nome)
+            def esperar_marcado(xp, el=None, timeout: float = 1.5) -> bool:
+                """Aguarda o item de `xp` ficar marcado (polling de 0.1s) em vez de pausa fixa.
 
-            xp_turma_tmpl = filtros.get('turma_label') or filtros.get('orgao_julgante_turma_label')
-            candidatos = []
-            if xp_turma_tmpl:
-                for lab in labels:
-                    try:
-                        candidatos.append(xp_turma_tmpl.format(lab))
-                    except Exception:
-                        pass
-            # Fallbacks por texto - seletores mais específicos
-            for lab in labels:
-                candidatos.extend([
-                    f"//div[contains(@class,'filtro-item')]//span[contains(@class,'nome-item') and normalize-space()='{lab}']",
-                    f"//div[contains(@class,'filtro-item')]//span[contains(normalize-space(),'{lab}')]",
-                    f"//span[contains(@class,'nome-item') and contains(normalize-space(),'{lab}')]",
-                ])
+                Reaproveita `el` (o elemento clicado); só relocaliza pelo XPath se ele ficar stale.
+                """
+                fim = time.monotonic() + timeout
+                while True:
+                    marcado = False
+                    if el is not None:
+                        try:
+                            marcado = self._is_marcado(el)
+                        except StaleElementReferenceException:
+                            el = None
+                    if el is None:
+                        # span + pai em uma única chamada; a verificação é feita no pai
+                        par = self._span_e_pai(xp)
+                        if par:
+                            el = par[1]
+                            marcado = verificar_filtro_marcado(el)
+                    if marcado:
+                        return True
+                    if time.monotonic() >= fim:
+                        return False
+                    time.sleep(0.1)
+
+            # Aguarda (no máximo 2s) algum candidato existir no DOM; se nenhum aparecer,
+            # pula as tentativas e segue direto para a expansão da lista
+            tentativas_iniciais = 3
+            if xp_union:
+                try:
+                    WebDriverWait(self.driver, 2.0, poll_frequency=0.1).until(
+                        lambda d: d.find_elements(By.XPATH, xp_union)
+                    )
+                except TimeoutException:
+                    logger.info(f"    Turma '{nome}' ainda não está na lista visível")
+                    tentativas_iniciais = 0
+                except Exception as e:
+                    logger.debug("    Erro aguardando candidatos de turma: %s", e)
 
             # Tenta até 3 vezes com verificação
-            for tentativa in range(3):
-                for xp in candidatos:
+            for tentativa in range(tentativas_iniciais):
+                hit = localizar_turma(candidatos, xp_union)
+                if hit:
                     try:
-                        itens = self.driver.find_elements(By.XPATH, xp)
-                        vis = [it for it in itens if (it.is_displayed() if hasattr(it,'is_displayed') else True)]
-                        if vis:
-                            span_el = vis[0]
+                        xp = hit['xpath']
+                        # Elemento pai (div.filtro-item) que é o elemento interativo
+                        el = hit.get('item') or hit['span']
 
-                            # Pega o elemento pai (div.filtro-item) que é o elemento interativo
-                            try:
-                                el = span_el.find_element(By.XPATH, "..")
-                            except:
-                                el = span_el
+                        # Verifica se já está marcado
+                        if hit.get('marcado'):
+                            logger.info(f"    ✓ Turma '{nome}' já marcada")
+                            return True
 
-                            # Verifica se já está marcado
-                            if verificar_filtro_marcado(el):
-                                logger.info(f"    ✓ Turma '{nome}' já marcada")
+                        # Tenta clicar
+                        self._scroll_center(el)
+                        self._hover(el)
+                        if self._safe_js_click(el):
+                            # Verifica se marcou
+                            if esperar_marcado(xp, el):
+                                logger.info(f"    ✓ Turma '{nome}' marcada com sucesso")
                                 return True
-
-                            # Tenta clicar
-                            self._scroll_center(el)
-                            self._hover(el)
-                            if self._safe_js_click(el):
-                                time.sleep(0.8)
-
-                                # Busca novamente e pega o pai
-                                itens_check = self.driver.find_elements(By.XPATH, xp)
-                                if itens_check:
-                                    try:
-                                        el_check = itens_check[0].find_element(By.XPATH, "..")
-                                    except:
-                                        el_check = itens_check[0]
-
-                                    # Verifica se marcou
-                                    if verificar_filtro_marcado(el_check):
-                                        logger.info(f"    ✓ Turma '{nome}' marcada com sucesso")
-                                        return True
-                                    else:
-                                        logger.warning(f"    ⚠ Tentativa {tentativa+1}: Turma '{nome}' não marcou")
                             else:
-                                # Tenta JS click como fallback
-                                try:
-                                    self.driver.execute_script("arguments[0].click();", el)
-                                    time.sleep(0.8)
-
-                                    # Busca novamente e pega o pai
-                                    itens_check = self.driver.find_elements(By.XPATH, xp)
-                                    if itens_check:
-                                        try:
-                                            el_check = itens_check[0].find_element(By.XPATH, "..")
-                                        except:
-                                            el_check = itens_check[0]
-
-                                        if verificar_filtro_marcado(el_check):
-                                            logger.info(f"    ✓ Turma '{nome}' marcada (JS) com sucesso")
-                                            return True
-                                        else:
-                                            logger.warning(f"    ⚠ Tentativa {tentativa+1} (JS): Turma '{nome}' não marcou")
-                                except Exception:
-                                    pass
-                    except Exception as e:
-                        logger.debug(f"    Erro na tentativa {tentativa+1} com xpath: {e}")
-                        continue
+                                logger.warning(f"    ⚠ Tentativa {tentativa+1}: Turma '{nome}' não marcou")
+                        else:
+                            # Tenta JS click como fallback
+                            try:
+                                self.driver.execute_script("arguments[0].click();", el)
+                                if esperar_marcado(xp, el):
+                                    logger.info(f"    ✓ Turma '{nome}' marcada (JS) com sucesso")
+                                    return True
+                                else:
+                                    logger.warning(f"    ⚠ Tentativa {tentativa+1} (JS): Turma '{nome}' não marcou")
+                            except Exception:
+                                pass
+                    except Exception as e:
+                        logger.debug("    Erro na tentativa %d com xpath: %s", tentativa + 1, e)
 
                 # Pequena pausa antes de tentar novamente
-                if tentativa < 2:
+                if tentativa < tentativas_iniciais - 1:
                     time.sleep(0.5)
 
             # Se não encontrou após 3 tentativas, tenta expandir a lista
@@ -2639,42 +3559,28 @@ class JTJurisTeste(BaseCase):
                 if expandir_lista_turmas():
                     logger.info(f"  🔍 Buscando '{nome}' após expansão...")
 
-                    # DIAGNÓSTICO: Lista todas as turmas disponíveis após expansão
-                    try:
-                        xp_debug = "//div[contains(@class,'filtro-item')]//span[contains(@class,'nome-item')]"
-                        todos_items = self.driver.find_elements(By.XPATH, xp_debug)
-                        turmas_visiveis = []
-                        for item in todos_items:
-                            try:
-                                if item.is_displayed():
-                                    texto = item.text.strip()
-                                    if 'Turma' in texto and 'TRT' not in texto:
-                                        turmas_visiveis.append(texto)
-                            except Exception:
-                                pass
-                        if turmas_visiveis:
-                            logger.info(f"    📋 Turmas disponíveis após expansão: {', '.join(turmas_visiveis)}")
-                        else:
-                            logger.warning(f"    ⚠ Nenhuma turma visível após expansão (pode indicar problema no XPath)")
-                    except Exception as e:
-                        logger.debug(f"    Erro ao listar turmas: {e}")
+                    # DIAGNÓSTICO (opcional): Lista todas as turmas disponíveis após expansão
+                    if os.environ.get("JT_DEBUG_TURMAS", "0") == "1" or logger.isEnabledFor(logging.DEBUG):
+                        try:
+                            turmas_visiveis = self.driver.execute_script(
+                                "return Array.from(document.querySelectorAll('div.filtro-item span.nome-item'))"
+                                ".filter(function (e) { return e.offsetParent !== null; })"
+                                ".map(function (e) { return (e.innerText || '').trim(); })"
+                                ".filter(function (t) { return t.indexOf('Turma') !== -1 && t.indexOf('TRT') === -1; });"
+                            ) or []
+                            if turmas_visiveis:
+                                logger.info(f"    📋 Turmas disponíveis após expansão: {', '.join(turmas_visiveis)}")
+                            else:
+                                logger.warning(f"    ⚠ Nenhuma turma visível após expansão (pode indicar problema no XPath)")
+                        except Exception as e:
+                            logger.debug("    Erro ao listar turmas: %s", e)
 
                     # ADICIONA: XPaths ainda mais genéricos para busca pós-expansão
-                    candidatos_expandidos = candidatos.copy()
-
-                    # Adiciona XPaths super genéricos para capturar elementos que podem ter estrutura diferente
-                    for lab in labels:
-                        candidatos_expandidos.extend([
-                            # Busca em QUALQUER div/span que contenha o texto exato
-                            f"//*[contains(@class,'filtro') and contains(text(),'{lab}')]",
-                            f"//*[contains(@class,'item') and contains(text(),'{lab}')]",
-                            # Busca por texto direto (mais permissivo)
-                            f"//*[contains(text(),'{lab}')]",
-                        ])
+                    candidatos_expandidos = _candidatos_turma_expandidos(nome, xp_turma_tmpl)
 
                     # Scroll para baixo para garantir que novos elementos estejam na viewport
                     try:
-                        logger.debug(f"    Scrollando para revelar novos elementos...")
+                        logger.debug("    Scrollando para revelar novos elementos...")
                         self._scroll_by(0.5)
                         time.sleep(0.5)
                         self._scroll_by(-0.3)  # Volta um pouco
@@ -2682,203 +3588,124 @@ class JTJurisTeste(BaseCase):
                     except Exception:
                         pass
 
-                    # Tenta novamente após expandir (mais 5 tentativas ao invés de 3)
-                    for tentativa in range(5):
-                        logger.debug(f"    Tentativa {tentativa+1}/5 após expansão...")
-
-                        for idx, xp in enumerate(candidatos_expandidos):
-                            try:
-                                itens = self.driver.find_elements(By.XPATH, xp)
-                                vis = [it for it in itens if (it.is_displayed() if hasattr(it,'is_displayed') else True)]
-
-                                if vis:
-                                    logger.debug(f"      XPath {idx+1} encontrou {len(vis)} elemento(s)")
-                                    span_el = vis[0]
+                    # Uma única espera (até 7s, polling de 0.2s) pelo primeiro candidato visível,
+                    # em vez de 5 tentativas com pausas fixas entre elas
+                    xp_union_exp = _xpath_uniao(candidatos_expandidos)
+                    try:
+                        hit = WebDriverWait(self.driver, 7.0, poll_frequency=0.2).until(
+                            lambda _d: localizar_turma(candidatos_expandidos, xp_union_exp)
+                        )
+                    except TimeoutException:
+                        hit = None
+                        logger.debug("    Nenhum candidato visível para '%s' após expansão", nome)
+                    except Exception as ex:
+                        hit = None
+                        logger.debug("    Erro aguardando candidatos após expansão: %s", ex)
+
+                    if hit:
+                        idx = hit.get('indice') or 0
+                        try:
+                            xp = hit['xpath']
+                            logger.debug("      XPath %d encontrou elemento visível", idx + 1)
+                            # Elemento pai (clicável)
+                            el = hit.get('item') or hit['span']
 
-                                    # Pega o elemento pai
-                                    try:
-                                        el = span_el.find_element(By.XPATH, "..")
-                                    except:
-                                        el = span_el
+                            if hit.get('marcado'):
+                                logger.info(f"    ✓ Turma '{nome}' já marcada (após expandir)")
+                                return True
 
-                                    if verificar_filtro_marcado(el):
-                                        logger.info(f"    ✓ Turma '{nome}' já marcada (após expandir)")
-                                        return True
+                            # ESTRATÉGIA MÚLTIPLA DE CLIQUE
+                            logger.debug("      🎯 Testando métodos de clique para '%s'...", nome)
 
-                                    # Validação: elemento está visível e habilitado?
-                                    try:
-                                        is_displayed = el.is_displayed()
-                                        is_enabled = el.is_enabled()
-                                        logger.debug(f"      Estado: displayed={is_displayed}, enabled={is_enabled}")
-                                        if not is_displayed:
-                                            logger.debug(f"      ⚠ Elemento não visível, pulando...")
-                                            continue
-                                    except Exception as e:
-                                        logger.debug(f"      Erro verificar estado: {e}")
-
-                                    # ESTRATÉGIA MÚLTIPLA DE CLIQUE
-                                    logger.debug(f"      🎯 Testando 5 métodos de clique para '{nome}'...")
-
-                                    # Scroll + Hover preparatório
-                                    self._scroll_center(el)
-                                    time.sleep(0.5)
-                                    self._hover(el)
-                                    time.sleep(0.4)
-
-                                    # Método 1: _safe_js_click
-                                    logger.debug(f"      [1/5] _safe_js_click...")
-                                    if self._safe_js_click(el):
-                                        time.sleep(1.2)
-                                        itens_check = self.driver.find_elements(By.XPATH, xp)
-                                        if itens_check:
-                                            try:
-                                                el_check = itens_check[0].find_element(By.XPATH, "..")
-                                            except:
-                                                el_check = itens_check[0]
-                                            if verificar_filtro_marcado(el_check):
-                                                logger.info(f"    ✅ '{nome}' marcada (método 1)")
-                                                return True
-
-                                    # Método 2: JS click direto
-                                    try:
-                                        logger.debug(f"      [2/5] JS click direto...")
-                                        self.driver.execute_script("arguments[0].click();", el)
-                                        time.sleep(1.2)
-                                        itens_check = self.driver.find_elements(By.XPATH, xp)
-                                        if itens_check:
-                                            try:
-                                                el_check = itens_check[0].find_element(By.XPATH, "..")
-                                            except:
-                                                el_check = itens_check[0]
-                                            if verificar_filtro_marcado(el_check):
-                                                logger.info(f"    ✅ '{nome}' marcada (método 2)")
-                                                return True
-                                    except Exception as e:
-                                        logger.debug(f"      Método 2 falhou: {e}")
-
-                                    # Método 3: ActionChains
-                                    try:
-                                        logger.debug(f"      [3/5] ActionChains...")
-                                        actions = ActionChains(self.driver)
-                                        actions.move_to_element(el).pause(0.3).click().perform()
-                                        time.sleep(1.2)
-                                        itens_check = self.driver.find_elements(By.XPATH, xp)
-                                        if itens_check:
-                                            try:
-                                                el_check = itens_check[0].find_element(By.XPATH, "..")
-                                            except:
-                                                el_check = itens_check[0]
-                                            if verificar_filtro_marcado(el_check):
-                                                logger.info(f"    ✅ '{nome}' marcada (método 3)")
-                                                return True
-                                    except Exception as e:
-                                        logger.debug(f"      Método 3 falhou: {e}")
-
-                                    # Método 4: Clique no span interno
-                                    try:
-                                        logger.debug(f"      [4/5] Span interno...")
-                                        span_interno = el.find_element(By.XPATH, ".//span[contains(@class,'nome-item')]")
-                                        self.driver.execute_script("arguments[0].click();", span_interno)
-                                        time.sleep(1.2)
-                                        itens_check = self.driver.find_elements(By.XPATH, xp)
-                                        if itens_check:
-                                            try:
-                                                el_check = itens_check[0].find_element(By.XPATH, "..")
-                                            except:
-                                                el_check = itens_check[0]
-                                            if verificar_filtro_marcado(el_check):
-                                                logger.info(f"    ✅ '{nome}' marcada (método 4)")
-                                                return True
-                                    except Exception as e:
-                                        logger.debug(f"      Método 4 falhou: {e}")
-
-                                    # Método 5: Dispatch MouseEvent
-                                    try:
-                                        logger.debug(f"      [5/5] Dispatch MouseEvent...")
-                                        self.driver.execute_script("""
-                                            var el = arguments[0];
-                                            var evt = new MouseEvent('click', {
-                                                view: window, bubbles: true, cancelable: true
-                                            });
-                                            el.dispatchEvent(evt);
-                                        """, el)
-                                        time.sleep(1.2)
-                                        itens_check = self.driver.find_elements(By.XPATH, xp)
-                                        if itens_check:
-                                            try:
-                                                el_check = itens_check[0].find_element(By.XPATH, "..")
-                                            except:
-                                                el_check = itens_check[0]
-                                            if verificar_filtro_marcado(el_check):
-                                                logger.info(f"    ✅ '{nome}' marcada (método 5)")
-                                                return True
-                                    except Exception as e:
-                                        logger.debug(f"      Método 5 falhou: {e}")
-
-                                    logger.debug(f"      ❌ Todos os 5 métodos falharam para XPath {idx+1}")
-                            except Exception as e:
-                                logger.debug(f"    Erro tentativa {tentativa+1} XPath {idx+1}: {e}")
-                                continue
+                            # Scroll + Hover preparatório
+                            self._scroll_center(el)
+                            time.sleep(0.5)
+                            self._hover(el)
+                            time.sleep(0.4)
+
+                            # Métodos JS (clique direto, span interno, MouseEvent) em uma única
+                            # função no navegador; cada chamada dispara a próxima estratégia e
+                            # devolve o estado, aguardando a mudança antes de tentar outra
+                            # (evita desmarcar com cliques consecutivos)
+                            proximo = 0
+                            while True:
+                                try:
+                                    r = self.driver.execute_script(_JS_CLIQUE_FILTRO, el, proximo) or {}
+                                except Exception as e:
+                                    logger.debug("      Clique JS falhou: %s", e)
+                                    break
+                                metodo = r.get('metodo') or 0
+                                if not metodo:
+                                    break
+                                logger.debug("      [%d/3] Estratégia JS %d...", metodo, metodo)
+                                if r.get('marcado') or esperar_marcado(xp, el):
+                                    logger.info(f"    ✅ '{nome}' marcada (JS {metodo})")
+                                    return True
+                                proximo = metodo
 
-                        # FALLBACK FINAL: Busca por texto exato via JavaScript (última tentativa)
-                        if tentativa == 4:
+                            # Fallback: ActionChains (mouse real) somente se o JS não marcou
                             try:
-                                logger.info(f"    🔧 FALLBACK FINAL: Busca JavaScript por texto exato...")
-                                for lab in labels:
-                                    js_find_and_click = f"""
-                                    var elementos = document.querySelectorAll('div.filtro-item, span.nome-item, div[class*="item"]');
-                                    var encontrado = false;
-                                    for (var i = 0; i < elementos.length; i++) {{
-                                        var el = elementos[i];
-                                        var texto = el.innerText || el.textContent;
-                                        if (texto && texto.trim() === '{lab}') {{
-                                            var clicavel = el.tagName === 'DIV' ? el : el.parentElement;
-                                            if (clicavel) {{
-                                                clicavel.click();
-                                                encontrado = true;
-                                                break;
-                                            }}
-                                        }}
-                                    }}
-                                    return encontrado;
-                                    """
-                                    resultado = self.driver.execute_script(js_find_and_click)
-                                    if resultado:
-                                        logger.info(f"    ⚡ JS encontrou e clicou em '{lab}'")
-                                        time.sleep(1.5)
-                                        # Valida
-                                        if candidatos:
-                                            itens_final = self.driver.find_elements(By.XPATH, candidatos[0])
-                                            if itens_final:
-                                                try:
-                                                    el_final = itens_final[0].find_element(By.XPATH, "..")
-                                                except:
-                                                    el_final = itens_final[0]
-                                                if verificar_filtro_marcado(el_final):
-                                                    logger.info(f"    ✅ '{nome}' marcada (JS final)")
-                                                    return True
+                                logger.debug("      ActionChains...")
+                                ac = ActionChains(self.driver)
+                                try:
+                                    ac.move_to_element(el).pause(0.3).click().perform()
+                                finally:
+                                    ac.reset_actions()
+                                if esperar_marcado(xp, el):
+                                    logger.info(f"    ✅ '{nome}' marcada (ActionChains)")
+                                    return True
                             except Exception as e:
-                                logger.debug(f"    Erro fallback JS final: {e}")
+                                logger.debug("      ActionChains falhou: %s", e)
+
+                            logger.debug("      ❌ Todos os métodos de clique falharam para XPath %d", idx + 1)
+                        except Exception as e:
+                            logger.debug("    Erro ao clicar (após expansão) XPath %d: %s", idx + 1, e)
 
-                        if tentativa < 4:
-                            time.sleep(0.7)  # Pausa maior entre tentativas
+                    # FALLBACK FINAL: Busca por texto exato via JavaScript
+                    try:
+                        logger.info(f"    🔧 FALLBACK FINAL: Busca JavaScript por texto exato...")
+                        for lab in labels:
+                            js_find_and_click = f"""
+                            var elementos = document.querySelectorAll('div.filtro-item, span.nome-item, div[class*="item"]');
+                            var encontrado = false;
+                            for (var i = 0; i < elementos.length; i++) {{
+                                var el = elementos[i];
+                                var texto = el.innerText || el.textContent;
+                                if (texto && texto.trim() === '{lab}') {{
+                                    var clicavel = el.tagName === 'DIV' ? el : el.parentElement;
+                                    if (clicavel) {{
+                                        clicavel.click();
+                                        encontrado = true;
+                                        break;
+                                    }}
+                                }}
+                            }}
+                            return encontrado;
+                            """
+                            resultado = self.driver.execute_script(js_find_and_click)
+                            if resultado:
+                                logger.info(f"    ⚡ JS encontrou e clicou em '{lab}'")
+                                # Valida
+                                if candidatos and esperar_marcado(candidatos[0]):
+                                    logger.info(f"    ✅ '{nome}' marcada (JS final)")
+                                    return True
+                    except Exception as e:
+                        logger.debug("    Erro fallback JS final: %s", e)
 
             logger.warning(f"  ✗ FALHA: Turma '{nome}' não pôde ser marcada após todas tentativas")
             return False
 
         # Caminho do DOCX de saída (mesmo diretório já usado pelo seu projeto)
-        workspace_dir = os.path.dirname(os.path.abspath(__file__))
-        default_docx = os.path.join(workspace_dir, "Diario_J_TST_com_variaveis.docx")
+        default_docx = str(_MODULE_DIR / "Diario_J_TST_com_variaveis.docx")
         docx_path = os.environ.get("JT_DOCX_PATH", default_docx)
+        # Usado por _finalizar_docx (tearDown) para o sumário final
+        self._docx_path = docx_path
         try:
-            abs_docx = os.path.abspath(docx_path)
+            abs_docx = Path(docx_path).resolve()
             logger.info(f"DOCX de saída configurado: {abs_docx}")
-            pasta_doc = os.path.dirname(abs_docx) or workspace_dir
-            if not os.path.isdir(pasta_doc):
-                logger.warning(f"Diretório do DOCX não existe (vai ser criado): {pasta_doc}")
-                os.makedirs(pasta_doc, exist_ok=True)
-            else:
-                logger.info(f"Diretório do DOCX OK: {pasta_doc}")
+            # Cria o diretório se necessário (sem checagem prévia de existência)
+            abs_docx.parent.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Diretório do DOCX OK: {abs_docx.parent}")
         except Exception:
             pass
 
@@ -2887,13 +3714,23 @@ class JTJurisTeste(BaseCase):
         logger.info("SELEÇÃO DE TRIBUNAIS")
         logger.info("="*80)
 
-        # Verifica se há variável de ambiente para modo não-interativo
+        # Ordem: --trts, depois JT_TRTS, depois JT_AUTO_MODE; o prompt só roda com TTY
+        trts_escolhidos = _parse_trts(_ler_trts_cli())
         modo_auto = os.environ.get("JT_AUTO_MODE", "0") == "1"
+        try:
+            tem_tty = bool(sys.stdin) and sys.stdin.isatty()
+        except Exception:
+            tem_tty = False
 
-        if modo_auto:
+        if trts_escolhidos:
+            logger.info(f"TRTs definidos por --trts/JT_TRTS: {', '.join(trts_escolhidos)}")
+        elif modo_auto:
             logger.info("Modo automático ativado (JT_AUTO_MODE=1)")
-            trts_escolhidos = ["TRT3", "TRT24"]
+            trts_escolhidos = list(_TRTS_PADRAO)
             logger.info(f"Executando TRTs: {', '.join(trts_escolhidos)}")
+        elif not tem_tty:
+            trts_escolhidos = list(_TRTS_PADRAO)
+            logger.warning(f"⚠️ Sem terminal interativo e sem --trts/JT_TRTS; usando padrão: {', '.join(trts_escolhidos)}")
         else:
             print("\n" + "="*80)
             print("  ESCOLHA OS TRIBUNAIS PARA PROCESSAR")
@@ -2957,11 +3794,17 @@ class JTJurisTeste(BaseCase):
                 inseridos = 0
                 vistos_ids = set()
                 numeros_processados = set()
+                # Amostra de cartões em que a ementa do DOM é conferida com a do clipboard
+                conferir_dom = getattr(self, 'ementa_dom_check', 0)
                 tentativas = 0
                 max_tentativas = 90
                 # Controle de páginas
                 pagina_atual = 1
                 max_paginas = 10
+                # Usa caminho real persistido se já houve fallback por arquivo bloqueado
+                destino_docx = getattr(self, '_docx_real_path', docx_path)
+                # Blocos acumulados em memória; um único open/save do DOCX ao final da turma
+                self._turma_buffer = []
                 while tentativas < max_tentativas and pagina_atual <= max_paginas:
                     cards = self._buscar_cartoes()
                     if not cards:
@@ -2970,18 +3813,49 @@ class JTJurisTeste(BaseCase):
                         cards = self._buscar_cartoes()
                         if not cards:
                             logger.info("Nenhum cartão nesta página.")
-                    for proximo in cards:
+                    # Ids de todos os cartões em uma chamada; os já vistos são descartados aqui,
+                    # antes de qualquer scroll/hover. A chave vale para a turma inteira (todas as
+                    # páginas): data-card-id quando existe, senão o id do WebElement, único por
+                    # nó. O id do DOM (pode ser por posição, ex.: card-0) só casa cabeçalhos
+                    try:
+                        ids_dom = self.driver.execute_script(_JS_IDS_CARTOES, cards) if cards else []
+                    except Exception:
+                        ids_dom = []
+                    if len(ids_dom) != len(cards):
+                        ids_dom = [('', '')] * len(cards)
+                    # Cabeçalhos de todos os cartões em uma chamada JS (alinhados com `cards`);
+                    # se falhar, um único page_source casado por id do DOM (ou por posição
+                    # quando as contagens batem)
+                    cab_cartoes = self._cabecalhos_dos_cartoes(cards) if cards else None
+                    cab_pagina = self._cabecalhos_da_pagina() if (cards and cab_cartoes is None) else []
+                    cab_por_id = {i: l for i, l in cab_pagina if i}
+                    cab_posicional = len(cab_pagina) == len(cards)
+                    # JT_EMENTA_DOM: texto de todas as ementas em uma chamada, sem clique/clipboard
+                    ementas_dom = self._ementas_dos_cartoes(cards) if (cards and getattr(self, 'ementa_dom', False)) else None
+                    pendentes = []
+                    for pos, ((data_id, dom_id), card) in enumerate(zip(ids_dom, cards)):
+                        cid = data_id or getattr(card, 'id', None)
+                        id_dom = data_id or dom_id
+                        if not (cid and cid in vistos_ids):
+                            if cab_cartoes is not None:
+                                linhas_pre = cab_cartoes[pos]
+                            elif id_dom and id_dom in cab_por_id:
+                                linhas_pre = cab_por_id[id_dom]
+                            elif cab_posicional:
+                                linhas_pre = cab_pagina[pos][1]
+                            else:
+                                linhas_pre = None
+                            pendentes.append((cid, card, linhas_pre, ementas_dom[pos] if ementas_dom else ''))
+                    for cid, proximo, linhas_pre, ementa_bruta in pendentes:
                         try:
-                            try:
-                                cid = proximo.id
-                            except Exception:
-                                cid = None
-                            if cid and cid in vistos_ids:
-                                continue
-                            self._scroll_center(proximo)
-                            self._hover(proximo)
-                            time.sleep(0.1)
-                            header_lines = self._extrair_cabecalho(proximo)
+                            header_lines = linhas_pre
+                            preparado = False
+                            if not header_lines:
+                                self._scroll_center(proximo)
+                                self._hover(proximo)
+                                time.sleep(0.1)
+                                preparado = True
+                                header_lines = self._extrair_cabecalho(proximo)
                             if not header_lines:
                                 self._scroll_by(0.3)
                                 time.sleep(0.2)
@@ -2991,17 +3865,9 @@ class JTJurisTeste(BaseCase):
                                     vistos_ids.add(cid)
                                 tentativas += 1
                                 continue
-                            # Filtrar seções de dissídios
+                            # Filtrar seções de dissídios (linhas já normalizadas em _extrair_cabecalho)
                             try:
-                                banned_terms = [
-                                    "1ª seção de dissídios individuais",
-                                    "2ª seção de dissídios individuais",
-                                    "seção de dissídios coletivos",
-                                ]
-                                def _norm_txt(s):
-                                    return re.sub(r"\s+", " ", (s or "")).strip().lower()
-                                hl_norm = [_norm_txt(x) for x in header_lines]
-                                if any(any(bt in h for bt in banned_terms) for h in hl_norm):
+                                if any(_RE_BANNED.search(h) for h in header_lines):
                                     if cid:
                                         vistos_ids.add(cid)
                                     tentativas += 1
@@ -3015,10 +3881,24 @@ class JTJurisTeste(BaseCase):
                                     vistos_ids.add(cid)
                                 tentativas += 1
                                 continue
-                            ementa = self._obter_ementa(proximo)
-                            # Usa caminho real persistido se já houve fallback por arquivo bloqueado
-                            destino_docx = getattr(self, '_docx_real_path', docx_path)
-                            self._append_to_docx(destino_docx, dados, header_lines, ementa)
+                            ementa = ''
+                            if ementa_bruta and len(ementa_bruta.strip()) > 50:
+                                ementa = self._limpar_ementa(
+                                    ementa_bruta.replace('\r\n', '\n').strip(), 'DOM',
+                                    exigir_marcador=self._xp_ementa_texto is None,
+                                )
+                            if ementa and conferir_dom > 0:
+                                conferir_dom -= 1
+                                self._conferir_ementa_dom(proximo, ementa)
+                            if not ementa:
+                                if not preparado:
+                                    # Cabeçalho veio do page_source: só agora traz o cartão para a
+                                    # viewport (o botão de copiar depende do hover)
+                                    self._scroll_center(proximo)
+                                    self._hover(proximo)
+                                    time.sleep(0.1)
+                                ementa = self._obter_ementa(proximo)
+                            self._turma_buffer.append(EmentaRecord(dados, header_lines, ementa))
                             inseridos += 1
                             if cid:
                                 vistos_ids.add(cid)
@@ -3027,13 +3907,10 @@ class JTJurisTeste(BaseCase):
                             self._scroll_by(0.45)
                             time.sleep(0.25)
                         except Exception as e:
-                            logger.error(f"Erro processando cartão {inseridos+1}: {e}")
-                            logger.debug(traceback.format_exc())
-                            try:
-                                cid = proximo.id
+                            logger.error("Erro processando cartão %d: %s", inseridos + 1, e)
+                            logger.debug("Traceback do cartão %d", inseridos + 1, exc_info=True)
+                            if cid:
                                 vistos_ids.add(cid)
-                            except Exception:
-                                pass
                             tentativas += 1
                     # Sempre tentar avançar para a próxima página até o limite
                     self._reveal_all_cards_on_page(max_scrolls=2, settle_cycles=1)
@@ -3046,11 +3923,19 @@ class JTJurisTeste(BaseCase):
                         logger.info("Não foi possível avançar para a próxima página. Finalizando paginação.")
                         break
                     pagina_atual += 1
-                    logger.info(f"📄 Avançou para a página {pagina_atual}")
+                    logger.info("📄 Avançou para a página %d", pagina_atual)
                     time.sleep(0.5)
-                logger.info(f"Blocos inseridos para a turma: {inseridos}")
+                # Arquivo bloqueado: o save grava no caminho alternativo e o guarda em
+                # self._docx_real_path, de onde a próxima turma já parte
+                self._flush_turma_to_docx(destino_docx, self._turma_buffer)
+                self._turma_buffer = []
+                logger.info("Blocos inseridos para a turma: %d", inseridos)
                 return inseridos
             except Exception:
+                # Não perde os blocos já extraídos se a paginação falhar no meio da turma
+                if getattr(self, '_turma_buffer', None):
+                    self._flush_turma_to_docx(getattr(self, '_docx_real_path', docx_path), self._turma_buffer)
+                    self._turma_buffer = []
                 return 0
 
         # Loop TRT -> Turmas sem recarregar página: alterna filtros no mesmo carregamento
@@ -3082,14 +3967,8 @@ class JTJurisTeste(BaseCase):
             """Desmarca o TRT atualmente selecionado clicando no X do chip"""
             try:
                 logger.info("  🧹 Desmarcando TRT anterior...")
-                # XPath para encontrar chip de TRT (não turma)
-                xp_remove_trt = (
-                    "//div[contains(@class,'p-chip')]"
-                    "[.//div[contains(@class,'p-chip-text') and contains(text(),'TRT')]]"
-                    "//span[contains(@class,'pi-chip-remove-icon') and contains(@class,'pi-times-circle')]"
-                )
-
-                removes = self.driver.find_elements(By.XPATH, xp_remove_trt)
+                # XPath para encontrar chip de TRT (não turma), montado uma vez no setUp
+                removes = self.driver.find_elements(By.XPATH, self._xp_remove_trt)
                 removidos = 0
 
                 for rem in removes:
@@ -3116,11 +3995,11 @@ class JTJurisTeste(BaseCase):
                 time.sleep(0.5)
 
             logger.info(f"🏛️ Alternando para {trt}...")
+            anterior = self._primeiro_cartao()
             selecionar_trt(trt)
 
-            # Espera mais tempo para garantir que o TRT está marcado e estável
-            time.sleep(1.2)
-            self._wait_results_loaded(30)
+            # Espera a lista de resultados ser substituída (sem pausa fixa)
+            self._aguardar_novos_resultados(anterior, 30)
 
             # Pequeno scroll após selecionar TRT para posicionar a lista
             try:
@@ -3149,9 +4028,9 @@ class JTJurisTeste(BaseCase):
             for turma in turmas:
                 # Marca a nova turma
                 logger.info(f"🔄 Selecionando {turma} no {trt}...")
+                anterior = self._primeiro_cartao()
                 selecionar_turma(turma)
-                time.sleep(0.8)
-                self._wait_results_loaded(25)
+                self._aguardar_novos_resultados(anterior, 25)
 
                 # Pequeno scroll após selecionar a Turma antes de extrair
                 try:
@@ -3172,49 +4051,39 @@ class JTJurisTeste(BaseCase):
                 total_geral += qtd_extraida
                 logger.info(f"✓ Concluída extração de {qtd_extraida} processos para {turma}.")
 
-                # Atualizar sumário com páginas reais ao fim de cada turma
-                if qtd_extraida > 0 and not getattr(self, 'skip_sumario', False):
+                # Sumário fica pendente; é atualizado uma vez ao fim do TRT
+                if qtd_extraida > 0:
+                    self._pending_sumario = True
+
+            # O sumário lê o arquivo: grava antes os blocos ainda em memória
+            self._flush_docx()
+
+            # Atualizar sumário com páginas reais uma vez por TRT (em vez de a cada turma);
+            # em final_only fica pendente para _atualizar_sumario_final
+            if (getattr(self, '_pending_sumario', False) and not getattr(self, 'skip_sumario', False)
+                    and getattr(self, '_toc_update_mode', 'per_flush') != 'final_only'):
+                try:
+                    logger.info(f"📖 Atualizando paginação real no sumário para {trt}...")
+                    # 1) Garante entradas via PAGEREF
                     try:
-                        logger.info(f"📖 Atualizando paginação real no sumário para {turma}...")
-                        # 1) Garante entradas via PAGEREF
-                        try:
-                            self._atualizar_sumario_com_pageref(docx_path, self._turma_bookmarks)
-                        except Exception as e1:
-                            logger.debug(f"Falha ao inserir PAGEREF: {e1}")
-                        # 2) Atualiza campos com Word COM (instância persistente)
-                        if not self._atualizar_sumario_win32(docx_path):
-                            logger.warning("⚠ Não foi possível calcular páginas via Word COM nesta etapa.")
-                        else:
-                            logger.info("✅ Paginação atualizada com sucesso no arquivo.")
-                    except Exception as e_sum:
-                        logger.error(f"Erro ao atualizar sumário parcial: {e_sum}")
+                        self._atualizar_sumario_com_pageref(docx_path, self._turma_bookmarks)
+                    except Exception as e1:
+                        logger.debug(f"Falha ao inserir PAGEREF: {e1}")
+                    # 2) Atualiza campos com Word COM (instância persistente)
+                    if not self._atualizar_sumario_win32(docx_path):
+                        logger.warning("⚠ Não foi possível calcular páginas via Word COM nesta etapa.")
+                    else:
+                        logger.info("✅ Paginação atualizada com sucesso no arquivo.")
+                except Exception as e_sum:
+                    logger.error(f"Erro ao atualizar sumário parcial: {e_sum}")
+                self._pending_sumario = False
 
+        self._flush_docx()
         logger.info(f"Concluído. Blocos inseridos no DOCX: {total_geral}")
         assert total_geral > 0, "Nenhum bloco foi inserido no documento."
 
-        # ATUALIZAÇÃO FINAL DO SUMÁRIO E LIMPEZA DO WORD
-        try:
-            if not getattr(self, 'skip_sumario', False):
-                self._atualizar_sumario_win32(docx_path)
-        except Exception as e:
-            logger.warning(f"Atualização final do sumário falhou: {e}")
-
-        # LIMPEZA FINAL: FECHAR O WORD (se aberto por _get_word_app)
-        try:
-            if getattr(self, '_word_app', None):
-                try:
-                    try:
-                        self._word_app.ScreenUpdating = True
-                    except Exception:
-                        pass
-                    self._word_app.Quit()
-                except Exception:
-                    pass
-                self._word_app = None
-                self._word_persistent = False
-                logger.info("Aplicação Word encerrada com sucesso.")
-        except Exception:
-            pass
+        # Atualização final do sumário e fechamento do Word ficam em _finalizar_docx
+        # (tearDown), para acontecerem também quando o teste falha no meio
 
         # Opcional: abrir pasta de saída automaticamente (defina JT_OPEN_FOLDER=1)
         try:
@@ -3237,7 +4106,7 @@ class JTJurisTeste(BaseCase):
         
         try:
             html = self.driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, _BS_PARSER)
             
             # Procurar por divs que contenham botões de copiar ementa
             cartoes_encontrados = []
@@ -3306,8 +4175,6 @@ class JTJurisTeste(BaseCase):
             return []
     
     def _buscar_cartoes(self) -> List:
-        sel = self.selectors.get('jt', {}).get('resultados', {})
-        caminhos = sel.get('cartao_root', [])
         
         # Debug: Verificar se há elementos na página
         if os.environ.get("JT_DEBUG_LOG", "0") == "1":
@@ -3332,24 +4199,9 @@ class JTJurisTeste(BaseCase):
             except Exception as e:
                 logger.error(f"DEBUG: Erro ao verificar elementos: {e}")
         
-        vistos = []
-        vistos_ids = set()
-        # 1) Tentar encontrar contêineres completos de cartões
-        for xp in caminhos:
-            try:
-                elems = self.driver.find_elements(By.XPATH, xp)
-                for e in elems:
-                    try:
-                        if not e.is_displayed():
-                            continue
-                    except Exception:
-                        continue
-                    key = e.id
-                    if key not in vistos_ids:
-                        vistos.append(e)
-                        vistos_ids.add(key)
-            except Exception:
-                continue
+        # 1) Tentar encontrar contêineres completos de cartões (uma consulta, visibilidade no navegador).
+        # WebElement tem hash/igualdade pelo id: dict.fromkeys deduplica preservando a ordem
+        vistos = list(dict.fromkeys(self._visiveis(self._xp_cartao_root, self._sel_cartao_root)))
         if vistos:
             return vistos
         
@@ -3357,7 +4209,7 @@ class JTJurisTeste(BaseCase):
         if os.environ.get("JT_DEBUG_LOG", "0") == "1":
             try:
                 html_content = self.driver.page_source
-                debug_file = os.path.join(os.path.dirname(__file__), "debug_jt_no_cards.html")
+                debug_file = str(_MODULE_DIR / "debug_jt_no_cards.html")
                 with open(debug_file, 'w', encoding='utf-8') as f:
                     f.write(html_content)
                 logger.info(f"DEBUG: HTML da página salvo em {debug_file}")
@@ -3365,31 +4217,18 @@ class JTJurisTeste(BaseCase):
                 logger.error(f"DEBUG: Erro ao salvar HTML: {e}")
         
         # 2) Fallback: localizar diretamente as seções de cabeçalho e subir ao ancestral com botão copiar
-        header_fb_paths = sel.get('header_section_fallback', [])
-        candidatos = []
-        for xp in header_fb_paths:
-            try:
-                secs = self.driver.find_elements(By.XPATH, xp)
-                for sec in secs:
-                    try:
-                        if not sec.is_displayed():
-                            continue
-                    except Exception:
-                        continue
-                    candidatos.append(sec)
-            except Exception:
-                continue
-        for sec in candidatos:
-            try:
-                # tentar pegar ancestral que contenha o botão de copiar
-                ancestors = sec.find_elements(By.XPATH, "ancestor::*[.//span[contains(@class,'doc-botao-icone') and normalize-space()='content_copy']]")
-                card = ancestors[0] if ancestors else sec
-                key = card.id
-                if key not in vistos_ids:
-                    vistos.append(card)
-                    vistos_ids.add(key)
-            except Exception:
-                continue
+        candidatos = self._visiveis(self._xp_header_fb, self._sel_header_fb)
+        # Ancestral com o botão de copiar resolvido no navegador para todas as seções de uma vez
+        # (em vez de um XPath ancestor::*[.//span...] por seção)
+        try:
+            cards_fb = self.driver.execute_script(_JS_CARTAO_DA_SECAO, candidatos) if candidatos else []
+        except Exception as e:
+            logger.debug("Falha ao resolver cartões a partir das seções: %s", e)
+            cards_fb = []
+        if len(cards_fb) != len(candidatos):
+            cards_fb = candidatos
+        # Várias seções podem levar ao mesmo cartão
+        vistos = list(dict.fromkeys(cards_fb))
         logger.info(f"Cartões via fallback de seção: {len(vistos)}")
         
         # 3) Fallback final: usar BeautifulSoup
@@ -3400,29 +4239,109 @@ class JTJurisTeste(BaseCase):
         return vistos
 
     # ---------- Extração do Cabeçalho ----------
+    def _cabecalhos_dos_cartoes(self, cards: List) -> Optional[List[List[str]]]:
+        """Linhas de cabeçalho de todos os cartões em uma única chamada JS, alinhadas com `cards`.
+
+        Retorna None se não for possível (o chamador tenta _cabecalhos_da_pagina).
+        """
+        if not (cards and self._xp_cabecalho and self._xp_cabecalho_linhas):
+            return None
+        try:
+            res = self.driver.execute_script(_JS_CABECALHOS_CARTOES, cards, self._xp_cabecalho, self._xp_cabecalho_linhas)
+        except Exception as e:
+            logger.debug("Falha ao extrair cabeçalhos via JS: %s", e)
+            return None
+        if not isinstance(res, list) or len(res) != len(cards):
+            return None
+        return [[_RE_WS.sub(" ", t).strip() for t in (linhas or []) if t] for linhas in res]
+
+    def _ementas_dos_cartoes(self, cards: List) -> Optional[List[str]]:
+        """Texto bruto da ementa de todos os cartões em uma única chamada JS, alinhado com `cards`.
+
+        Retorna None se não for possível (o chamador usa o botão de copiar por cartão).
+        """
+        if not cards:
+            return None
+        try:
+            res = self.driver.execute_script(_JS_EMENTAS_CARTOES, cards, self._xp_ementa_texto)
+        except Exception as e:
+            logger.debug("Falha ao ler ementas via DOM: %s", e)
+            return None
+        if not isinstance(res, list) or len(res) != len(cards):
+            return None
+        return [t or '' for t in res]
+
+    def _conferir_ementa_dom(self, card, ementa_dom: str) -> bool:
+        """Compara a ementa limpa lida do DOM com a do botão de copiar (JT_EMENTA_DOM_CHECK).
+
+        Só registra no log; o bloco continua usando a ementa do DOM.
+        """
+        try:
+            self._scroll_center(card)
+            self._hover(card)
+            time.sleep(0.1)
+            ementa_clip = self._obter_ementa(card)
+        except Exception as e:
+            logger.debug("Conferência da ementa do DOM falhou: %s", e)
+            return False
+        if not ementa_clip:
+            return False
+        if ementa_clip == ementa_dom:
+            logger.info("✓ Ementa do DOM confere com a do clipboard (%d caracteres)", len(ementa_dom))
+            return True
+        logger.warning("⚠ Ementa do DOM difere da do clipboard (DOM %d / clipboard %d caracteres)",
+                       len(ementa_dom), len(ementa_clip))
+        logger.debug("DOM: %s...\nClipboard: %s...", ementa_dom[:200], ementa_clip[:200])
+        return False
+
+    def _cabecalhos_da_pagina(self) -> List[Tuple[str, List[str]]]:
+        """Linhas de cabeçalho de todos os cartões da página a partir de um único page_source.
+
+        Avalia os mesmos seletores (cartao_root, cabecalho_section, cabecalho_linhas) com lxml,
+        sem chamadas ao driver por cartão. Retorna [(id_dom, linhas)] na ordem do documento,
+        ou [] se não for possível (o chamador cai em _extrair_cabecalho).
+        """
+        xp_cartao = self._xp_cartao_root
+        xp_cab = self._xp_cabecalho
+        xp_linhas = self._xp_cabecalho_linhas
+        if lxml_html is None or not (xp_cartao and xp_cab and xp_linhas):
+            return []
+        try:
+            raiz = lxml_html.document_fromstring(self.driver.page_source)
+            resultado = []
+            for card in raiz.xpath(xp_cartao):
+                linhas = []
+                for sec in card.xpath(xp_cab):
+                    for l in sec.xpath(xp_linhas):
+                        t = _RE_WS.sub(" ", l.text_content() or "").strip()
+                        if t:
+                            linhas.append(t)
+                    if linhas:
+                        break
+                resultado.append((card.get('data-card-id') or card.get('id') or '', linhas))
+            return resultado
+        except Exception as e:
+            logger.debug("Falha ao extrair cabeçalhos do page_source: %s", e)
+            return []
+
     def _extrair_cabecalho(self, card) -> List[str]:
-        sel = self.selectors.get('jt', {}).get('resultados', {})
-        cab_paths = sel.get('cabecalho_section', [])
-        for rel in cab_paths:
+        xp_linhas = self._xp_cabecalho_linhas
+        # Todas as alternativas de seção em uma única consulta relativa ao cartão
+        for sec in self._find_uniao(self._xp_cabecalho, self._sel_cabecalho_section, card):
             try:
-                secs = card.find_elements(By.XPATH, rel)
-                for sec in secs:
+                if not sec.is_displayed():
+                    continue
+                linhas = sec.find_elements(By.XPATH, xp_linhas)
+                textos = []
+                for l in linhas:
                     try:
-                        if not sec.is_displayed():
-                            continue
+                        t = (l.text or '').strip()
+                        if t:
+                            textos.append(_RE_WS.sub(" ", t))
                     except Exception:
                         continue
-                    linhas = sec.find_elements(By.XPATH, sel.get('cabecalho_linhas', ".//div[contains(@class,'doc-texto') ]"))
-                    textos = []
-                    for l in linhas:
-                        try:
-                            t = (l.text or '').strip()
-                            if t:
-                                textos.append(re.sub(r"\s+", " ", t))
-                        except Exception:
-                            continue
-                    if textos:
-                        return textos
+                if textos:
+                    return textos
             except Exception:
                 continue
         # Fallback: se o próprio 'card' for uma seção com as linhas
@@ -3433,7 +4352,7 @@ class JTJurisTeste(BaseCase):
                 try:
                     t = (l.text or '').strip()
                     if t:
-                        textos.append(re.sub(r"\s+", " ", t))
+                        textos.append(_RE_WS.sub(" ", t))
                 except Exception:
                     continue
             if textos:
@@ -3443,6 +4362,10 @@ class JTJurisTeste(BaseCase):
         return []
 
     def _montar_dados_a_partir_do_cabecalho(self, linhas: List[str]) -> Tuple[dict, Optional[str]]:
+        """Monta os campos do bloco a partir das linhas do cabeçalho.
+
+        As linhas já chegam normalizadas por _extrair_cabecalho (strip + espaços colapsados).
+        """
         numero = ''
         orgao = ''
         relator = ''
@@ -3450,46 +4373,39 @@ class JTJurisTeste(BaseCase):
         tipo_doc = ''
         tribunal_tag = None
 
+        # Linhas unidas uma vez; cada campo é uma única busca com padrão pré-compilado
+        texto = "\n".join(linhas)
+
         # 1) número CNJ na primeira/segunda linha
-        cnj_re = re.compile(r"\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}")
-        for base in linhas[:2]:
-            m = cnj_re.search(base)
-            if m:
-                numero = m.group(0)
-                break
+        m = _RE_CNJ.search("\n".join(linhas[:2]))
+        if m:
+            numero = m.group(0)
 
         # 2) tribunal (TRTn) e tipo de doc (segunda linha costuma ser o tipo)
         if linhas:
             # Primeira linha contém ex.: "TRT3 - ROT <número>"
-            trib_m = re.search(r"\bTRT\d{1,2}\b", linhas[0])
+            trib_m = _RE_TRIB.search(linhas[0])
             if trib_m:
                 tribunal_tag = trib_m.group(0)
         if len(linhas) >= 2:
-            tipo_doc = linhas[1].strip()
+            tipo_doc = linhas[1]
 
         # 3) relatoria
-        for s in linhas:
-            n = s.strip()
-            if re.search(r"\bRelatoria de\b", n, re.IGNORECASE):
-                relator = re.sub(r".*Relatoria de\s*", "", n, flags=re.IGNORECASE).strip()
-                break
-
-        # 4) turma (para Órgão Judicante)
-        for s in linhas:
-            n = s.strip()
-            if re.search(r"\b\d{1,2}ª\s*Turma\b", n, re.IGNORECASE):
-                orgao = n
-                break
+        m = _RE_RELATORIA.search(texto)
+        if m:
+            relator = m.group(1).strip()
+
+        # 4) turma (para Órgão Judicante): a linha inteira
+        m = _RE_TURMA_CAB.search(texto)
+        if m:
+            orgao = m.group(0)
         if not orgao and tribunal_tag:
             orgao = tribunal_tag
 
         # 5) data de juntada -> mapeamos como Publicação
-        for s in linhas:
-            n = s.strip()
-            if re.search(r"Juntado aos autos em", n, re.IGNORECASE):
-                dt = re.sub(r".*Juntado aos autos em\s*", "", n, flags=re.IGNORECASE).strip()
-                publicacao = dt
-                break
+        m = _RE_JUNTADA.search(texto)
+        if m:
+            publicacao = m.group(1).strip()
 
         dados = {
             'numero_processo': numero,
@@ -3510,8 +4426,8 @@ class JTJurisTeste(BaseCase):
             logger.warning("Clipboard desabilitado por variável de ambiente.")
             return ''
         
-        if pyperclip is None:
-            logger.warning("pyperclip não disponível")
+        if pyperclip is None and win32clipboard is None:
+            logger.warning("pyperclip/win32clipboard não disponível")
             return ''
         
         # Encontrar botão de copiar
@@ -3540,7 +4456,7 @@ class JTJurisTeste(BaseCase):
             
             # Limpar clipboard antes
             try:
-                pyperclip.copy('')
+                _fast_copy('')
             except Exception:
                 pass
             
@@ -3549,39 +4465,42 @@ class JTJurisTeste(BaseCase):
                 logger.warning("Clique no botão de copiar falhou.")
                 return ''
             
-            # Aguardar mais tempo para garantir que o texto foi copiado
-            time.sleep(2.0)
-            
-            # Tentar múltiplas vezes se necessário
-            max_tentativas = 3
+            # Polling do clipboard até chegar o texto, no máximo os mesmos 5s de antes. Com
+            # win32clipboard cada leitura é uma chamada direta à API, então o intervalo é curto
             ementa = ''
-            
-            for tentativa in range(max_tentativas):
+            fim = time.monotonic() + 5.0
+            intervalo = 0.02 if win32clipboard is not None else 0.1
+            erro_clip = None
+            while True:
                 try:
-                    ementa = pyperclip.paste() or ''
-                    if ementa and ementa.strip() and len(ementa.strip()) > 50:
+                    ementa = _fast_paste()
+                    if ementa and len(ementa.strip()) > 50:
                         break
-                    if tentativa < max_tentativas - 1:
-                        logger.warning(f"Tentativa {tentativa + 1}: clipboard vazio ou muito curto, aguardando...")
-                        time.sleep(1.5)
                 except Exception as e:
-                    logger.error(f"Erro ao obter texto do clipboard (tentativa {tentativa + 1}): {e}")
-                    if tentativa < max_tentativas - 1:
-                        time.sleep(1.5)
+                    erro_clip = e
+                if time.monotonic() >= fim:
+                    if erro_clip is not None:
+                        logger.error("Erro ao obter texto do clipboard: %s", erro_clip)
+                    else:
+                        logger.warning("Clipboard vazio ou muito curto após aguardar 5s.")
+                    break
+                time.sleep(intervalo)
             
             if ementa and ementa.strip():
                 # Normalizar quebras de linha
                 ementa = ementa.replace('\r\n', '\n').replace('\r', '\n')
                 ementa = ementa.strip()
 
-                # LIMPEZA DE HTML: Remove tags HTML se presentes
-                if '<div' in ementa or '<section' in ementa or '<button' in ementa:
+                # LIMPEZA DE HTML: Remove tags HTML se presentes no próprio texto (o botão pode
+                # copiar marcação como texto simples). Só o texto decide: CF_HTML acompanha
+                # qualquer cópia de seleção e o parse apagaria as URLs entre <...>
+                if _RE_MARCACAO_HTML.search(ementa):
                     logger.warning("⚠ Detectado HTML no clipboard. Limpando...")
 
                     # Usa BeautifulSoup se disponível
                     if BeautifulSoup:
                         try:
-                            soup = BeautifulSoup(ementa, 'html.parser')
+                            soup = BeautifulSoup(ementa, _BS_PARSER)
 
                             # Remove elementos indesejados
                             for tag in soup.find_all(['button', 'script', 'style']):
@@ -3589,217 +4508,120 @@ class JTJurisTeste(BaseCase):
 
                             # Pega apenas o texto
                             ementa = soup.get_text(separator=' ', strip=True)
-                            logger.info(f"✓ HTML limpo com BeautifulSoup")
+                            logger.info("✓ HTML limpo com BeautifulSoup")
                         except Exception as e:
-                            logger.warning(f"Erro ao limpar HTML com BeautifulSoup: {e}")
+                            logger.warning("Erro ao limpar HTML com BeautifulSoup: %s", e)
                             # Fallback: regex simples
-                            ementa = re.sub(r'<[^>]+>', '', ementa)
-                            ementa = re.sub(r'\s+', ' ', ementa).strip()
+                            ementa = _RE_TAG_HTML.sub('', ementa)
+                            ementa = _RE_WS.sub(" ", ementa).strip()
                     else:
                         # Fallback: regex simples para remover tags
-                        ementa = re.sub(r'<[^>]+>', '', ementa)
-                        ementa = re.sub(r'\s+', ' ', ementa).strip()
-
-                # Remove o cabeçalho "Acórdão" se presente
-                ementa = re.sub(r'^Acórdão\s*', '', ementa, flags=re.IGNORECASE)
-
-                # Remove "Inteiro teor" e variações (incluindo variações com parênteses e sem)
-                ementa = re.sub(r'Inteiro teor\s*\([^\)]*\)', '', ementa, flags=re.IGNORECASE)
-                ementa = re.sub(r'Inteiro teor[^\n\.]*', '', ementa, flags=re.IGNORECASE)
-                ementa = re.sub(r'\s+Inteiro\s+teor\s*', ' ', ementa, flags=re.IGNORECASE)
-
-                # Remove botão "ler inteiro teor" se presente
-                ementa = re.sub(r'\s*ler inteiro teor\s*,?\s*', ' ', ementa, flags=re.IGNORECASE)
-
-                # Remove fragmentos de texto cortado que aparecem antes da ementa (ex: "...1731-25.2010.5.24.0022")
-                ementa = re.sub(r'\.{3,}\d{4}-\d{2}\.\d{4}\.\d+\.\d{2}\.\d{4}[^\n]*', '', ementa)
-
-                # Procurar pela seção "Ementa:" e pegar apenas o que vem depois
-                # O clipboard traz: cabeçalho + possível texto do acórdão + "Ementa: \n" + texto da ementa
-                match = re.search(r'Ementa:\s*\n(.+)', ementa, re.DOTALL | re.IGNORECASE)
-                if match:
-                    ementa = match.group(1).strip()
-                    logger.info(f"✓ Ementa extraída (após 'Ementa:'): {len(ementa)} caracteres")
-                else:
-                    # Tenta encontrar "Ementa:" sem quebra de linha
-                    match2 = re.search(r'Ementa:\s*(.+)', ementa, re.DOTALL | re.IGNORECASE)
-                    if match2:
-                        ementa = match2.group(1).strip()
-                        logger.info(f"✓ Ementa extraída (após 'Ementa:' inline): {len(ementa)} caracteres")
-                    else:
-                        logger.info(f"✓ Ementa obtida via clipboard (sem marcador 'Ementa:'): {len(ementa)} caracteres")
-
-                # Limpa espaços múltiplos e reticências cortadas
-                ementa = re.sub(r'\s+', ' ', ementa).strip()
-                ementa = re.sub(r'\.{4,}', '...', ementa)  # Normaliza reticências
-
-                # Remove texto cortado no início/fim (ex: "...uando")
-                ementa = re.sub(r'^\.{3,}[a-z]+\s+', '', ementa)  # Remove início cortado
-                ementa = re.sub(r'\s+[a-z]+\.{3,}$', '', ementa)  # Remove fim cortado
-
-                # NÃO remove informações do tribunal - mantém tudo da ementa
-                # Remove apenas limpeza final de espaços múltiplos
-                ementa = re.sub(r'\s+', ' ', ementa).strip()
-
-                # Debug: mostrar início e fim da ementa
-                if os.environ.get("JT_DEBUG_LOG", "0") == "1":
-                    logger.info(f"Início da ementa limpa: {ementa[:150]}...")
-                    logger.info(f"Fim da ementa limpa: ...{ementa[-150:]}")
+                        ementa = _RE_TAG_HTML.sub('', ementa)
+                        ementa = _RE_WS.sub(" ", ementa).strip()
 
-                return ementa
+                return self._limpar_ementa(ementa)
             else:
                 logger.warning("Clipboard vazio ou muito curto após todas as tentativas.")
                 return ''
                 
         except Exception as e:
-            logger.error(f"Erro ao copiar ementa: {e}")
+            logger.error("Erro ao copiar ementa: %s", e)
             return ''
 
+    def _limpar_ementa(self, ementa: str, origem: str = 'clipboard', exigir_marcador: bool = False) -> str:
+        """Limpa o texto bruto (clipboard ou DOM) e devolve só a ementa.
+
+        Com exigir_marcador=True, retorna '' se não houver 'Ementa:' (o texto seria o cartão inteiro).
+        """
+        # Remove "Acórdão", "Inteiro teor", "ler inteiro teor" e fragmentos cortados
+        ementa = _RE_EMENTA_LIXO.sub(_repl_ementa_lixo, ementa)
+
+        # Procurar pela seção "Ementa:" e pegar apenas o que vem depois
+        # O clipboard traz: cabeçalho + possível texto do acórdão + "Ementa: \n" + texto da ementa
+        match = _RE_MARCADOR_EMENTA.search(ementa)
+        if match:
+            ementa = match.group(1).strip()
+            logger.info("✓ Ementa extraída (após 'Ementa:'): %d caracteres", len(ementa))
+        else:
+            # Tenta encontrar "Ementa:" sem quebra de linha
+            match2 = _RE_MARCADOR_EMENTA_INLINE.search(ementa)
+            if match2:
+                ementa = match2.group(1).strip()
+                logger.info("✓ Ementa extraída (após 'Ementa:' inline): %d caracteres", len(ementa))
+            elif exigir_marcador:
+                return ''
+            else:
+                logger.info("✓ Ementa obtida via %s (sem marcador 'Ementa:'): %d caracteres", origem, len(ementa))
+
+        # Reticências e texto cortado no início/fim; os padrões já aceitam espaços
+        # múltiplos, então o colapso de espaços fica só para a passada final
+        ementa = ementa.strip()
+        for pat, repl in _EMENTA_CLEANERS_FINAIS:
+            ementa = pat.sub(repl, ementa)
+
+        # NÃO remove informações do tribunal - mantém tudo da ementa
+        # Remove apenas limpeza final de espaços múltiplos
+        ementa = _RE_WS.sub(" ", ementa).strip()
+
+        # Debug: mostrar início e fim da ementa
+        if os.environ.get("JT_DEBUG_LOG", "0") == "1":
+            logger.info("Início da ementa limpa: %s...", ementa[:150])
+            logger.info("Fim da ementa limpa: ...%s", ementa[-150:])
+
+        return ementa
+
     # ---------- DOCX (mantendo formatação) ----------
-    def _append_to_docx(self, doc_path: str, dados: dict, header_lines: List[str], ementa: str):
+    def _flush_turma_to_docx(self, doc_path: str, buffer: List[EmentaRecord]) -> str:
+        """Monta todos os blocos do buffer no Document em memória; o save fica com _flush_docx.
+
+        Os EmentaRecords entram na ordem do buffer, antes do Sumário. O arquivo só é
+        gravado quando os blocos pendentes chegam a _save_every (JT_SAVE_EVERY).
+        Retorna o caminho efetivamente usado (muda se houver fallback por bloqueio).
+        """
+        if not buffer:
+            return doc_path
         try:
-            # ---- DEBUG LOGGING ----
-            if os.environ.get("JT_DEBUG_LOG", "0") == "1":
-                logger.info("---- DADOS PARA GRAVAÇÃO ----")
-                logger.info(f"HEADER: {header_lines}")
-                logger.info(f"DADOS: {dados}")
-                logger.info(f"EMENTA (primeiros 300 chars): {ementa[:300] if ementa else '<<VAZIA>>'}")
-                logger.info("--------------------------")
-            # ---- FIM DEBUG LOGGING ----
-
-            logger.info(f"Gravando bloco no DOCX: {os.path.abspath(doc_path)}")
-            # Garante documento com 'Sumário' no topo quando for novo
-            if os.path.exists(doc_path):
-                doc = Document(doc_path)
+            logger.info("Montando %d bloco(s) do DOCX: %s", len(buffer), doc_path)
+            # Continua no Document pendente (blocos ainda não salvos) ou faz uma única leitura
+            # (ou reaproveita o objeto do último save, se o arquivo não mudou)
+            pendente = getattr(self, '_doc_pendente', None)
+            if pendente and os.path.abspath(pendente[0]) == os.path.abspath(doc_path):
+                doc = pendente[1]
             else:
-                doc = self._prepare_document_with_sumario(doc_path)
-            # Garantir que haja 'Sumário' mesmo em documento existente
-            _ = self._prepare_document_with_sumario(doc_path)
-            doc = Document(doc_path)
-
-            # Localizar parágrafo 'Sumário' para inserir ANTES dele
-            suminfo = self._buscar_sumario_em_documento(doc)
+                self._flush_docx()
+                doc = self._carregar_docx(doc_path)
+            self._estilo_ementa_id = self._garantir_estilo_ementa(doc)
+            # Localizar parágrafo 'Sumário' para inserir ANTES dele (continua válido após as inserções)
+            suminfo = self._ensure_sumario_inplace(doc)
             anchor_para = suminfo['elemento'] if suminfo else None
-            if anchor_para is None:
-                # Fallback: se não encontrou, cria e recarrega
-                doc = self._prepare_document_with_sumario(doc_path)
-                doc = Document(doc_path)
-                suminfo = self._buscar_sumario_em_documento(doc)
-                anchor_para = suminfo['elemento'] if suminfo else None
-
-            # Se for a primeira ocorrência de uma Turma/Bloco, criar heading e bookmark ANTES do Sumário
-            try:
-                orgao = (dados or {}).get('referencias', {}).get('Órgão Judicante') or (dados or {}).get('referencias', {}).get('Orgão Judicante') or ''
-                ident = self._extrair_id_bloco(orgao)
-                logger.info(f"🔍 Órgão Judicante: {orgao} → Identificador: {ident}")
-            except Exception as e:
-                logger.warning(f"Erro ao extrair ID do bloco: {e}")
-                ident = None
-            if ident and ident not in self._turma_bookmarks and anchor_para is not None:
-                titulo = self._descricao_por_identificador(ident)
-                p_head = anchor_para.insert_paragraph_before(titulo)
+            for rec in buffer:
                 try:
-                    p_head.style = 'Heading 1'
-                except Exception:
-                    pass
-                bm_name = self._sanitizar_nome_bookmark(f"BM_TURMA_{ident}")
-                self._inserir_bookmark_no_paragrafo(doc, p_head, bm_name)
-                self._turma_bookmarks[ident] = bm_name
-                logger.info(f"📍 Bookmark criado: {ident} → {bm_name}")
-                # separação após heading
-                anchor_para.insert_paragraph_before('')
-
-            # Inserir bloco (cabeçalho + 'Ementa:' + ementa) ANTES do Sumário
-            if anchor_para is not None:
-                # separador em branco antes do bloco
-                anchor_para.insert_paragraph_before('')
-                # Cabeçalho + rótulo 'Ementa:'
-                linhas = list(header_lines or [])
-                # Ementa
-                linhas.append('Ementa:')  # Ementa
-                for hl in linhas:
-                    if hl is None:
-                        continue
-                    p = anchor_para.insert_paragraph_before('')
-                    self._format_line(p, hl)
-                # Ementa com hyperlinks inline
-                p_em = anchor_para.insert_paragraph_before('')
-                # Reusar lógica de hyperlink: construir diretamente no parágrafo
-                try:
-                    # Texto da ementa com espaço final para facilitar reconhecimento de URLs no Word
-                    ementa_txt = (ementa or '').rstrip()
-                    if ementa_txt:
-                        ementa_txt = ementa_txt + ' '
-                    # Implementação local: mesma usada em _add_ementa_with_inline_links
-                    def add_text_run_local(pp, t: str):
-                        if not t:
-                            return
-                        r = pp.add_run(t)
-                        r.font.name = 'Arial MT'
-                        r.font.size = Pt(8)
-                    def add_hyperlink_run_local(pp, display: str, url: str):
-                        r_id = pp.part.relate_to(url, RT.HYPERLINK, is_external=True)
-                        hl = OxmlElement('w:hyperlink')
-                        hl.set(qn('r:id'), r_id)
-                        run = OxmlElement('w:r')
-                        rPr = OxmlElement('w:rPr')
-                        rStyle = OxmlElement('w:rStyle')
-                        rStyle.set(qn('w:val'), 'Hyperlink')
-                        rFonts = OxmlElement('w:rFonts')
-                        rFonts.set(qn('w:ascii'), 'Arial MT')
-                        rFonts.set(qn('w:hAnsi'), 'Arial MT')
-                        rFonts.set(qn('w:cs'), 'Arial MT')
-                        sz = OxmlElement('w:sz')
-                        sz.set(qn('w:val'), '16')
-                        rPr.append(rStyle)
-                        rPr.append(rFonts)
-                        rPr.append(sz)
-                        run.append(rPr)
-                        t = OxmlElement('w:t')
-                        t.text = display
-                        run.append(t)
-                        hl.append(run)
-                        pp._p.append(hl)
-                    # Parágrafo formatado
-                    pf = p_em.paragraph_format
-                    pf.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-                    pf.line_spacing_rule = WD_LINE_SPACING.DOUBLE
-                    pattern = re.compile(r'<(https?://[^>\s]+)>|(https?://\S+)')
-                    pos = 0
-                    texto = ementa_txt
-                    for m in pattern.finditer(texto):
-                        start, end = m.start(), m.end()
-                        add_text_run_local(p_em, texto[pos:start])
-                        url = m.group(1) or m.group(2)
-                        bracketed = m.group(1) is not None
-                        if bracketed:
-                            add_text_run_local(p_em, '<')
-                        add_hyperlink_run_local(p_em, url, url)
-                        if bracketed:
-                            add_text_run_local(p_em, '>')
-                        pos = end
-                    add_text_run_local(p_em, texto[pos:])
-                except Exception:
-                    # Fallback simples
-                    self._format_line(p_em, ementa or '')
-                # separador final
-                anchor_para.insert_paragraph_before('')
-            else:
-                # Fallback: inserir no final como antes (caso raro)
-                doc.add_paragraph('')
-                linhas = list(header_lines or [])
-                linhas.append('Ementa:')  # Ementa
-                for hl in linhas:
-                    if hl is None:
-                        continue
-                    p = doc.add_paragraph()
-                    self._format_line(p, hl)
-                ementa_txt = (ementa or '').rstrip()
-                if ementa_txt:
-                    ementa_txt = ementa_txt + ' '
-                self._add_ementa_with_inline_links(doc, ementa_txt)
-                doc.add_paragraph('')
+                    self._inserir_bloco_docx(doc, anchor_para, rec.dados, rec.header_lines, rec.ementa)
+                except Exception as e:
+                    logger.error("Erro ao montar bloco no DOCX: %s", e)
+                    logger.debug("Traceback da montagem do bloco", exc_info=True)
+            self._doc_pendente = (doc_path, doc)
+            self._pending_writes = getattr(self, '_pending_writes', 0) + len(buffer)
+            save_every = 1 if getattr(self, '_toc_update_mode', 'per_flush') == 'per_block' else getattr(self, '_save_every', 1)
+            if self._pending_writes >= save_every:
+                doc_path = self._flush_docx() or doc_path
+        except Exception as e:
+            logger.error(f"Erro ao escrever no DOCX: {e}")
+            logger.debug("Traceback da gravação no DOCX", exc_info=True)
+        return doc_path
 
+    def _flush_docx(self) -> Optional[str]:
+        """Salva o Document pendente: uma serialização para todos os blocos acumulados.
+
+        Retorna o caminho gravado (muda se houver fallback por bloqueio) ou None se não havia pendência.
+        """
+        pendente = getattr(self, '_doc_pendente', None)
+        if not pendente:
+            return None
+        self._doc_pendente = None
+        self._pending_writes = 0
+        doc_path, doc = pendente
+        try:
             try:
                 doc.save(doc_path)
             except PermissionError as pe:
@@ -3813,84 +4635,106 @@ class JTJurisTeste(BaseCase):
                     doc_path = alt_path
                 except Exception:
                     raise pe
-            try:
-                sz = os.path.getsize(doc_path)
-                mt = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(os.path.getmtime(doc_path)))
-                logger.info(f"DOCX salvo: tamanho={sz} bytes | mtime={mt}")
-            except Exception:
-                pass
-            # Tentar atualizar o Sumário/TOC via Word COM imediatamente após salvar (por turma)
+            # Um único stat: assinatura do cache e dados do log
+            assinatura = self._registrar_docx_salvo(doc_path, doc)
+            if assinatura:
+                mtime_ns, sz = assinatura
+                mt = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(mtime_ns / 1e9))
+                logger.info("DOCX salvo: tamanho=%d bytes | mtime=%s", sz, mt)
+            # Sumário/TOC via Word COM logo após salvar só nos modos per_block/per_flush;
+            # em final_only (padrão) a repaginação acontece uma única vez, no fim
+            if getattr(self, '_toc_update_mode', 'per_flush') == 'final_only':
+                return doc_path
             try:
                 try:
                     updated = self._atualizar_sumario_win32(doc_path)
                 except Exception:
                     updated = False
                 if updated:
-                    logger.info("Sumário atualizado via Word COM após salvar o bloco.")
+                    logger.info("Sumário atualizado via Word COM após salvar os blocos.")
                 else:
                     logger.debug("Atualização do Sumário via Word COM retornou False ou não foi possível.")
             except Exception:
                 logger.debug("Falha silenciosa ao tentar atualizar sumário via Word COM.")
         except Exception as e:
             logger.error(f"Erro ao escrever no DOCX: {e}")
-            logger.debug(traceback.format_exc())
+            logger.debug("Traceback da gravação no DOCX", exc_info=True)
+        return doc_path
 
-    def _add_ementa_with_inline_links(self, doc: Document, texto: str):
+    def _inserir_bloco_docx(self, doc: Document, anchor_para, dados: dict, header_lines: List[str], ementa: str):
+        """Monta um bloco (heading da turma, cabeçalho, ementa) no Document em memória, sem salvar."""
+        # ---- DEBUG LOGGING ----
+        if os.environ.get("JT_DEBUG_LOG", "0") == "1":
+            logger.info("---- DADOS PARA GRAVAÇÃO ----")
+            logger.info("HEADER: %s", header_lines)
+            logger.info("DADOS: %s", dados)
+            logger.info("EMENTA (primeiros 300 chars): %s", ementa[:300] if ementa else '<<VAZIA>>')
+            logger.info("--------------------------")
+        # ---- FIM DEBUG LOGGING ----
+
+        # Se for a primeira ocorrência de uma Turma/Bloco, criar heading e bookmark ANTES do Sumário
+        try:
+            orgao = (dados or {}).get('referencias', {}).get('Órgão Judicante') or (dados or {}).get('referencias', {}).get('Orgão Judicante') or ''
+            ident = self._extrair_id_bloco(orgao)
+            logger.info("🔍 Órgão Judicante: %s → Identificador: %s", orgao, ident)
+        except Exception as e:
+            logger.warning("Erro ao extrair ID do bloco: %s", e)
+            ident = None
+        if ident and ident not in self._turma_bookmarks and anchor_para is not None:
+            titulo = self._descricao_por_identificador(ident)
+            p_head = anchor_para.insert_paragraph_before(titulo)
+            try:
+                p_head.style = 'Heading 1'
+            except Exception:
+                pass
+            bm_name = _nome_bookmark_turma(ident)
+            self._inserir_bookmark_no_paragrafo(doc, p_head, bm_name)
+            self._turma_bookmarks[ident] = bm_name
+            logger.info("📍 Bookmark criado: %s → %s", ident, bm_name)
+            # separação após heading
+            anchor_para.insert_paragraph_before('')
+
+        # Inserir bloco (cabeçalho + 'Ementa:' + ementa) ANTES do Sumário
+        if anchor_para is not None:
+            # Cabeçalho + rótulo 'Ementa:'; cada linha já nasce com o texto. O separador em
+            # branco antes do bloco virou espaçamento na primeira linha (um parágrafo a menos)
+            linhas = [hl for hl in (header_lines or []) if hl is not None]
+            linhas.append('Ementa:')  # Ementa
+            for i, (key, value) in enumerate(map(_kv_linha, linhas)):
+                p = self._inserir_kv_antes(anchor_para, key, value)
+                if i == 0:
+                    p.paragraph_format.space_before = _ESPACO_ENTRE_BLOCOS
+            # Ementa com hyperlinks inline
+            p_em = anchor_para.insert_paragraph_before('')
+            # Reusar lógica de hyperlink: construir diretamente no parágrafo
+            try:
+                # Parágrafo formatado; espaço final para facilitar reconhecimento de URLs no Word
+                self._formatar_paragrafo_bloco(p_em)
+                _append_ementa_runs(p_em, ementa or '', self._rel_ids_do_part(p_em.part), espaco_final=True)
+            except Exception:
+                # Fallback simples
+                self._format_line(p_em, ementa or '')
+            # separador final
+            anchor_para.insert_paragraph_before('')
+        else:
+            # Fallback: inserir no final como antes (caso raro)
+            linhas = [hl for hl in (header_lines or []) if hl is not None]
+            linhas.append('Ementa:')  # Ementa
+            for i, (key, value) in enumerate(map(_kv_linha, linhas)):
+                p = doc.add_paragraph()
+                self._format_kv(p, key, value)
+                if i == 0:
+                    p.paragraph_format.space_before = _ESPACO_ENTRE_BLOCOS
+            self._add_ementa_with_inline_links(doc, ementa or '', espaco_final=True)
+            doc.add_paragraph('')
+
+    def _add_ementa_with_inline_links(self, doc: Document, texto: str, espaco_final: bool = False):
         try:
             p = doc.add_paragraph()
-            pf = p.paragraph_format
-            pf.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-            pf.line_spacing_rule = WD_LINE_SPACING.DOUBLE
+            self._formatar_paragrafo_bloco(p)
 
-            def add_text_run(t: str):
-                if not t:
-                    return
-                r = p.add_run(t)
-                r.font.name = 'Arial MT'
-                r.font.size = Pt(8)
-
-            def add_hyperlink_run(display: str, url: str):
-                # cria relação externa
-                r_id = p.part.relate_to(url, RT.HYPERLINK, is_external=True)
-                hl = OxmlElement('w:hyperlink')
-                hl.set(qn('r:id'), r_id)
-                run = OxmlElement('w:r')
-                rPr = OxmlElement('w:rPr')
-                # estilo Hyperlink (azul sublinhado)
-                rStyle = OxmlElement('w:rStyle')
-                rStyle.set(qn('w:val'), 'Hyperlink')
-                # Fonte e tamanho
-                rFonts = OxmlElement('w:rFonts')
-                rFonts.set(qn('w:ascii'), 'Arial MT')
-                rFonts.set(qn('w:hAnsi'), 'Arial MT')
-                rFonts.set(qn('w:cs'), 'Arial MT')
-                sz = OxmlElement('w:sz')
-                sz.set(qn('w:val'), '16')
-                rPr.append(rStyle)
-                rPr.append(rFonts)
-                rPr.append(sz)
-                run.append(rPr)
-                t = OxmlElement('w:t')
-                t.text = display
-                run.append(t)
-                hl.append(run)
-                p._p.append(hl)
-
-            # Regex: <url> ou url simples
-            pattern = re.compile(r'<(https?://[^>\s]+)>|(https?://\S+)')
-            pos = 0
-            for m in pattern.finditer(texto):
-                start, end = m.start(), m.end()
-                add_text_run(texto[pos:start])
-                url = m.group(1) or m.group(2)
-                bracketed = m.group(1) is not None
-                if bracketed:
-                    add_text_run('<')
-                add_hyperlink_run(url, url)
-                if bracketed:
-                    add_text_run('>')
-                pos = end
-            add_text_run(texto[pos:])
+            # <url> ou url simples viram hyperlinks
+            _append_ementa_runs(p, texto, self._rel_ids_do_part(p.part), espaco_final)
         except Exception:
             # fallback simples
             p = doc.add_paragraph(texto)
@@ -3898,8 +4742,8 @@ class JTJurisTeste(BaseCase):
             pf.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
             pf.line_spacing_rule = WD_LINE_SPACING.DOUBLE
             run = p.runs[0]
-            run.font.name = 'Arial MT'
-            run.font.size = Pt(8)
+            run.font.name = _ARIAL
+            run.font.size = _PT8
             return
 
     def _atualizar_sumario_win32(self, doc_path: str) -> bool:
@@ -3971,103 +4815,84 @@ class JTJurisTeste(BaseCase):
             pf = p.paragraph_format
             pf.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
             pf.line_spacing_rule = WD_LINE_SPACING.DOUBLE
-            def add_text_run(t: str):
-                if not t:
-                    return
-                r = p.add_run(t)
-                r.font.name = 'Arial MT'
-                r.font.size = Pt(8)
-            def add_hyperlink_run(display: str, url: str):
-                r_id = p.part.relate_to(url, RT.HYPERLINK, is_external=True)
-                hl = OxmlElement('w:hyperlink')
-                hl.set(qn('r:id'), r_id)
-                run = OxmlElement('w:r')
-                rPr = OxmlElement('w:rPr')
-                rStyle = OxmlElement('w:rStyle')
-                rStyle.set(qn('w:val'), 'Hyperlink')
-                rFonts = OxmlElement('w:rFonts')
-                rFonts.set(qn('w:ascii'), 'Arial MT')
-                rFonts.set(qn('w:hAnsi'), 'Arial MT')
-                rFonts.set(qn('w:cs'), 'Arial MT')
-                sz = OxmlElement('w:sz')
-                sz.set(qn('w:val'), '16')
-                rPr.append(rStyle)
-                rPr.append(rFonts)
-                rPr.append(sz)
-                run.append(rPr)
-                t = OxmlElement('w:t')
-                t.text = display
-                run.append(t)
-                hl.append(run)
-                p._p.append(hl)
-            pattern = re.compile(r'<(https?://[^>\s]+)>|(https?://\S+)')
-            pos = 0
-            texto = texto or ''
-            for m in pattern.finditer(texto):
-                start, end = m.start(), m.end()
-                add_text_run(texto[pos:start])
-                url = m.group(1) or m.group(2)
-                bracketed = m.group(1) is not None
-                if bracketed:
-                    add_text_run('<')
-                add_hyperlink_run(url, url)
-                if bracketed:
-                    add_text_run('>')
-                pos = end
-            add_text_run(texto[pos:])
+            _append_ementa_runs(p, texto or '', self._rel_ids_do_part(p.part))
             return p
         except Exception:
             run = p.add_run(texto or '')
-            run.font.name = 'Arial MT'
-            run.font.size = Pt(8)
+            run.font.name = _ARIAL
+            run.font.size = _PT8
             pf = p.paragraph_format
             pf.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
             pf.line_spacing_rule = WD_LINE_SPACING.DOUBLE
             return p
 
+    def _inserir_kv_antes(self, anchor_para, key: str, value: Optional[str]):
+        """Parágrafo antes de anchor_para criado já com o texto de uma linha tokenizada por _kv_linha."""
+        p = anchor_para.insert_paragraph_before(key)
+        run = p.runs[0] if p.runs else p.add_run('')
+        _fonte_arial8(run)
+        if value is not None or key.strip().lower() == 'ementa:':
+            run.bold = True
+        if value is not None:
+            _fonte_arial8(p.add_run(value))
+        self._formatar_paragrafo_bloco(p)
+        return p
+
     def _format_line(self, paragrafo, linha: str):
-        parts = linha.split(':', 1)
-        if len(parts) == 2 and parts[0].strip() and parts[1] is not None:
-            key, value = parts
-           
-            run_key = paragrafo.add_run(f"{key.strip()}:")
-            run_key.bold = True
-            run_key.font.name = 'Arial MT'
-            run_key.font.size = Pt(8)
-
-            run_val = paragrafo.add_run(f" {value.strip()}")
-            run_val.font.name = 'Arial MT'
-            run_val.font.size = Pt(8)
-        else:
-            run = paragrafo.add_run(linha)
-            run.font.name = 'Arial MT'
-            run.font.size = Pt(8)
-            if linha.strip().lower() == 'ementa:':
-                run.bold = True
+        self._format_kv(paragrafo, *_kv_linha(linha))
+
+    def _format_kv(self, paragrafo, key: str, value: Optional[str]):
+        """Runs de uma linha já tokenizada por _kv_linha: sem split/strip aqui."""
+        run = paragrafo.add_run(key)
+        _fonte_arial8(run)
+        if value is not None:
+            run.bold = True
+            _fonte_arial8(paragrafo.add_run(value))
+        elif key.strip().lower() == 'ementa:':
+            run.bold = True
+
+        self._formatar_paragrafo_bloco(paragrafo)
+
+    def _garantir_estilo_ementa(self, doc: Document) -> Optional[str]:
+        """Cria o estilo _ESTILO_EMENTA no documento se faltar e devolve o style_id (None se falhar)."""
+        try:
+            styles = doc.styles
+            try:
+                estilo = styles[_ESTILO_EMENTA]
+            except KeyError:
+                estilo = styles.add_style(_ESTILO_EMENTA, WD_STYLE_TYPE.PARAGRAPH)
+                try:
+                    estilo.base_style = styles['Normal']
+                except KeyError:
+                    pass
+                pf = estilo.paragraph_format
+                pf.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+                pf.line_spacing_rule = WD_LINE_SPACING.DOUBLE
+            return estilo.style_id
+        except Exception as e:
+            logger.debug("Não foi possível criar o estilo %s: %s", _ESTILO_EMENTA, e)
+            return None
 
-        pf = paragrafo.paragraph_format
-        pf.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-        pf.line_spacing_rule = WD_LINE_SPACING.DOUBLE
+    def _formatar_paragrafo_bloco(self, p):
+        """Justificado + espaçamento duplo: w:pStyle do estilo dos blocos, ou formatação direta sem ele."""
+        estilo = getattr(self, '_estilo_ementa_id', None)
+        if estilo:
+            # Direto no XML: p.style = nome faria uma busca por nome em styles.xml a cada parágrafo
+            p._p.style = estilo
+        else:
+            pf = p.paragraph_format
+            pf.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+            pf.line_spacing_rule = WD_LINE_SPACING.DOUBLE
 
 
 # Execução: usar pytest para rodar a classe acima, exemplo:
 # pytest -q "jt_juris_teste 1.py" -k test_extrair_jt -s --headed
 
-if __name__ == "__main__":
-    # Para executar diretamente, sem pytest:
-    # python "jt_juris_teste 1.py"
-    #
-    # Para ver o navegador, defina a variável de ambiente:
-    # $env:JT_HEADED="1"
-    #
-    # Para ativar o log de debug da gravação no DOCX:
-    # $env:JT_DEBUG_LOG="1"
 
+def _executar_com_sb(headed_mode: bool):
+    """Roda test_extrair_jt numa sessão SB() própria (sem pytest) e devolve a instância do teste."""
     from seleniumbase import SB
-    
-    # Checa se o modo headed está ativado por variável de ambiente
-    headed_mode = os.environ.get("JT_HEADED", "0") == "1"
-    
+
     # Usa o gerenciador de contexto SB() para inicializar corretamente
     with SB(headed=headed_mode, test=True) as sb:
         # Cria instância da classe de teste
@@ -4081,8 +4906,19 @@ if __name__ == "__main__":
         test_case.selectors = test_case._load_selectors()
         test_case._turma_bookmarks = {}
         test_case._bookmark_id_counter = 1
+        test_case._doc_cache = None
+        test_case._rel_id_cache = None
+        test_case._pending_sumario = False
+        test_case._turma_buffer = []
+        test_case._doc_pendente = None
+        test_case._pending_writes = 0
+        test_case._save_every = _ler_save_every()
+        test_case._toc_update_mode = _ler_toc_update_mode()
         test_case.skip_sumario = os.environ.get("JT_SKIP_SUMARIO", "0") == "1"
         test_case.disable_clipboard = os.environ.get("JT_DISABLE_CLIPBOARD", "0") == "1"
+        test_case.ementa_dom = os.environ.get("JT_EMENTA_DOM", "0") == "1"
+        test_case.ementa_dom_check = _ler_ementa_dom_check()
+        test_case._preparar_xpaths()
         
         # Copia métodos úteis do SB para a instância
         test_case.open = sb.open
@@ -4097,4 +4933,94 @@ if __name__ == "__main__":
             logger.info("Teste concluído com sucesso!")
         except Exception as e:
             logger.error(f"Ocorreu um erro durante a execução do teste: {e}")
-            logger.error(traceback.format_exc())
\ No newline at end of file
+            logger.error(traceback.format_exc())
+        finally:
+            # Sem pytest não há tearDown: blocos pendentes, sumário final e Word aqui
+            test_case._finalizar_docx()
+    return test_case
+
+
+def _worker_trt(trt: str, docx_parcial: str, headed_mode: bool) -> Tuple[str, dict]:
+    """Processo filho do JT_PARALLEL: um TRT, um Chrome e um DOCX parcial, sem sumário/Word COM."""
+    os.environ["JT_TRTS"] = trt
+    os.environ["JT_DOCX_PATH"] = docx_parcial
+    os.environ["JT_SKIP_SUMARIO"] = "1"
+    os.environ["JT_OPEN_FOLDER"] = "0"
+    # O processo filho herda o sys.argv do pai (--trts com todos os TRTs): só o JT_TRTS vale
+    sys.argv = sys.argv[:1]
+    test_case = _executar_com_sb(headed_mode)
+    return getattr(test_case, '_docx_real_path', docx_parcial), dict(getattr(test_case, '_turma_bookmarks', {}))
+
+
+def _executar_trts_em_paralelo(trts: List[str], headed_mode: bool):
+    """Um processo (e um Chrome) por TRT; os DOCX parciais são mesclados no final, na ordem de `trts`."""
+    default_docx = str(_MODULE_DIR / "Diario_J_TST_com_variaveis.docx")
+    docx_path = os.environ.get("JT_DOCX_PATH", default_docx)
+    pasta_tmp = tempfile.mkdtemp(prefix="jt_parcial_")
+    logger.info(f"⚡ JT_PARALLEL: {len(trts)} processos ({', '.join(trts)}); parciais em {pasta_tmp}")
+    parciais = []
+    with ProcessPoolExecutor(max_workers=len(trts)) as pool:
+        futuros = [
+            pool.submit(_worker_trt, trt, os.path.join(pasta_tmp, f"{trt}.docx"), headed_mode)
+            for trt in trts
+        ]
+        for trt, futuro in zip(trts, futuros):
+            try:
+                parciais.append(futuro.result())
+            except Exception as e:
+                logger.error(f"Processo do {trt} falhou: {e}")
+
+    test_case = JTJurisTeste(methodName='test_extrair_jt')
+    test_case._turma_bookmarks = {}
+    test_case._bookmark_id_counter = 1
+    test_case._doc_cache = None
+    test_case._word_app = None
+    test_case._word_persistent = False
+    test_case.skip_sumario = os.environ.get("JT_SKIP_SUMARIO", "0") == "1"
+    try:
+        Path(docx_path).resolve().parent.mkdir(parents=True, exist_ok=True)
+        test_case._mesclar_docx_parciais(docx_path, parciais)
+        logger.info(f"✅ DOCX final mesclado: {os.path.abspath(docx_path)}")
+    except Exception as e:
+        logger.error(f"Erro ao mesclar DOCX parciais (mantidos em {pasta_tmp}): {e}")
+        logger.error(traceback.format_exc())
+        return
+    shutil.rmtree(pasta_tmp, ignore_errors=True)
+
+    if not test_case.skip_sumario:
+        try:
+            test_case._open_word_app()
+            test_case._atualizar_sumario_com_pageref(docx_path, test_case._turma_bookmarks)
+            if test_case._atualizar_sumario_win32(docx_path):
+                logger.info("✅ Sumário atualizado no DOCX final.")
+        except Exception as e:
+            logger.warning(f"Atualização do sumário após mesclagem falhou: {e}")
+        finally:
+            test_case._close_word_app()
+
+
+if __name__ == "__main__":
+    # Para executar diretamente, sem pytest:
+    # python "jt_juris_teste 1.py"
+    #
+    # Para ver o navegador, defina a variável de ambiente:
+    # $env:JT_HEADED="1"
+    #
+    # Para ativar o log de debug da gravação no DOCX:
+    # $env:JT_DEBUG_LOG="1"
+    #
+    # Para escolher os TRTs sem o menu interativo:
+    # python "jt_juris_teste 1.py" --trts TRT3,TRT24   (ou $env:JT_TRTS="TRT3")
+    # pytest "jt_juris_teste 1.py" --trts TRT3          (opção registrada no conftest.py)
+    #
+    # Para rodar cada TRT em um processo/navegador próprio (exige --trts/JT_TRTS com 2+ TRTs):
+    # $env:JT_PARALLEL="1"
+
+    # Checa se o modo headed está ativado por variável de ambiente
+    headed_mode = os.environ.get("JT_HEADED", "0") == "1"
+    
+    trts_cli = _parse_trts(_ler_trts_cli())
+    if os.environ.get("JT_PARALLEL", "0") == "1" and len(trts_cli) > 1:
+        _executar_trts_em_paralelo(trts_cli, headed_mode)
+    else:
+        _executar_com_sb(headed_mode)